@@ -0,0 +1,203 @@
+"""
+Asyncio RabbitMQ Consumer Module
+
+This module runs several RabbitMQ queue consumers on a single asyncio event loop using pika's
+`AsyncioConnection` adapter, instead of one `BlockingConnection` and one thread per queue.
+
+Features:
+- One connection and one channel per queue, all driven by the same event loop.
+- Configurable concurrency per queue through an `InFlightWindow`; the broker prefetch count
+  matches the window, so every queue keeps up to `window.size` deliveries in flight at once.
+- Blocking message handlers (HTTP calls, text extraction) run in a shared executor so the
+  event loop is never blocked.
+- Acknowledgements go through an `AckBatcher` per channel, so messages are acked only after the
+  handler finished, in `multiple=True` batches.
+- Graceful shutdown on SIGINT/SIGTERM: consumers are cancelled, in-flight deliveries finish
+  and are acknowledged before the connection is closed.
+
+Handler contract:
+    A handler is a callable `handler(body)` that runs in the executor and returns:
+        - True: the message was processed, it is acknowledged.
+        - False: the message can never be processed (e.g. unknown ID), it is rejected without requeue.
+    If the handler raises, the message is rejected and requeued for another attempt.
+"""
+
+import asyncio
+import functools
+import signal
+from concurrent.futures import ThreadPoolExecutor
+
+import pika
+from pika.adapters.asyncio_connection import AsyncioConnection
+
+from Qtip_fapi.flow_control import AckBatcher
+
+
+class AsyncConsumer:
+    """
+    Consumes several queues concurrently on one asyncio event loop.
+
+    Args:
+        host (str): The hostname for RabbitMQ.
+        queues (dict): Maps a queue name to a `(handler, window)` tuple, where `window` is the
+            queue's `InFlightWindow`.
+        executor (Executor, optional): Executor running the blocking handlers. A thread pool
+            sized to the sum of all windows is created when omitted.
+        open_ack_batcher (callable, optional): `open_ack_batcher(queue, channel, call_later)`
+            factory for the channel's `AckBatcher`. A default batcher is used when omitted.
+    """
+
+    def __init__(self, host, queues, executor=None, open_ack_batcher=None):
+        self.host = host
+        self.queues = queues
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=sum(window.size for _, window in queues.values())
+        )
+        self.open_ack_batcher = open_ack_batcher or (
+            lambda queue, channel, call_later: AckBatcher(channel, call_later)
+        )
+        self._loop = None
+        self._connection = None
+        self._batchers = {}
+        self._channels = {}
+        self._consumer_tags = {}
+        self._tasks = set()
+        self._stopping = False
+
+    def run(self):
+        """
+        Starts the event loop and blocks until the consumer is stopped.
+
+        Actions:
+            - Opens the connection to RabbitMQ.
+            - Installs SIGINT/SIGTERM handlers that trigger a graceful stop.
+            - Runs the event loop until the connection is closed.
+        """
+
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # Not in the main thread or not supported by the platform.
+                pass
+
+        self._connection = AsyncioConnection(
+            pika.ConnectionParameters(host=self.host),
+            on_open_callback=self._on_connection_open,
+            on_open_error_callback=self._on_connection_open_error,
+            on_close_callback=self._on_connection_closed,
+            custom_ioloop=self._loop,
+        )
+        try:
+            self._loop.run_forever()
+        finally:
+            self.executor.shutdown(wait=True)
+            self._loop.close()
+
+    def stop(self):
+        """
+        Stops consuming and closes the connection once in-flight deliveries are settled.
+        """
+
+        if self._stopping:
+            return
+        self._stopping = True
+        print("Stopping asyncio consumer...")
+        for queue, channel in self._channels.items():
+            consumer_tag = self._consumer_tags.get(queue)
+            if consumer_tag and channel.is_open:
+                channel.basic_cancel(consumer_tag)
+        self._loop.create_task(self._close_when_idle())
+
+    async def _close_when_idle(self):
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        for batcher in self._batchers.values():
+            batcher.flush()
+        if self._connection.is_open:
+            self._connection.close()
+        else:
+            self._loop.stop()
+
+    def attach_channel(self, queue, channel):
+        """
+        Starts consuming a queue on a channel the consumer did not open itself.
+
+        Args:
+            queue (str): One of the consumer's `queues`.
+            channel: An open channel with pika's channel interface (e.g. an in-memory test channel).
+
+        Notes:
+            - Must be called on a running event loop, which becomes the consumer's loop if `run`
+              did not start one. The channel then goes through the same queue declaration, QoS and
+              `basic_consume` steps as a channel opened on the consumer's own connection.
+        """
+
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        self._on_channel_open(queue, channel)
+
+    def _on_connection_open(self, connection):
+        for queue in self.queues:
+            connection.channel(on_open_callback=functools.partial(self._on_channel_open, queue))
+
+    def _on_connection_open_error(self, connection, error):
+        print(f"Connection to RabbitMQ failed: {error}")
+        self._loop.stop()
+
+    def _on_connection_closed(self, connection, reason):
+        print(f"Connection to RabbitMQ closed: {reason}")
+        self._loop.stop()
+
+    def _on_channel_open(self, queue, channel):
+        self._channels[queue] = channel
+        channel.queue_declare(
+            queue=queue,
+            durable=True,
+            callback=lambda _frame: self._set_qos(queue, channel),
+        )
+
+    def _set_qos(self, queue, channel):
+        _, window = self.queues[queue]
+        self._batchers[queue] = self.open_ack_batcher(queue, channel, self._loop.call_later)
+        channel.basic_qos(
+            prefetch_count=window.size,
+            callback=lambda _frame: self._start_consuming(queue, channel),
+        )
+
+    def _start_consuming(self, queue, channel):
+        self._consumer_tags[queue] = channel.basic_consume(
+            queue=queue,
+            on_message_callback=functools.partial(self._on_message, queue),
+        )
+        print(f"Waiting for messages in queue '{queue}'...")
+
+    def _on_message(self, queue, channel, method, properties, body):
+        _, window = self.queues[queue]
+        if not window.acquire():
+            print(f"In-flight window full for '{queue}', requeueing message.")
+            channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            return
+        self._batchers[queue].track(method.delivery_tag)
+        task = self._loop.create_task(self._dispatch(queue, method.delivery_tag, body))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, queue, delivery_tag, body):
+        handler, window = self.queues[queue]
+        batcher = self._batchers[queue]
+        try:
+            processed = await self._loop.run_in_executor(self.executor, handler, body)
+        except Exception as e:
+            print(f"Error handling message from '{queue}': {e}")
+            batcher.nack(delivery_tag, requeue=True)
+            return
+        finally:
+            window.release()
+
+        if processed:
+            batcher.ack(delivery_tag)
+        else:
+            batcher.nack(delivery_tag, requeue=False)
@@ -0,0 +1,323 @@
+"""
+Receiver Data Access Module
+
+This module provides the data sources the RabbitMQ receiver uses to look up presentation files and
+questions. Both expose the same blocking interface so message handlers can run them from worker threads.
+
+Features:
+- `HttpDataSource`: calls the FastAPI endpoints (`/knowledgebase/{id}`, `/question/{id}`,
+  `/question/batch`) over a `PooledHttpClient`, which keeps connections alive and retries transient failures.
+- `DirectDataSource`: runs the `repository` queries in-process on its own event loop and database
+  pool, skipping the HTTP round trip through uvicorn and the routers.
+- `BatchLoader`: merges single-question lookups made at the same time by different worker threads
+  into one `fetch_questions` call, i.e. one database round trip.
+
+Interface:
+    fetch_presentation_files(presentation_id) -> list | None
+    fetch_question(question_id) -> dict | None
+    fetch_questions(question_ids) -> dict (found questions keyed by requested ID)
+    close() -> None
+
+    `None` (or a missing key) means the record does not exist. Any other failure raises, so the
+    message can be retried.
+"""
+
+import asyncio
+import time
+from threading import Event, Lock, Thread, local
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from Qtip_fapi import repository
+from Qtip_fapi.database import database
+
+RETRY_STATUSES = (502, 503, 504)
+
+
+class PooledHttpClient:
+    """
+    Thread-safe HTTP client with a shared keep-alive connection pool.
+
+    Args:
+        pool_size (int): Maximum number of connections kept open per host.
+        timeout (tuple): `(connect, read)` timeouts in seconds applied to every request.
+        retries (int): Number of retries for connection errors and 502/503/504 responses.
+        backoff (float): Backoff factor between retries (`backoff * 2 ** (retry - 1)` seconds).
+
+    Notes:
+        - Only idempotent methods (GET, PUT) are resent after the request may have reached the
+          server (read errors, timeouts, 502/503/504). A POST that wrote a row and then timed out
+          would write it again, so POSTs are only retried when the caller asks (`post(retry=True)`),
+          for POST endpoints that only read.
+        - All threads share one `HTTPAdapter`, whose urllib3 pool is thread-safe. Each thread gets
+          its own `requests.Session` on top of it because sessions are not.
+        - `pool_block=True` makes threads wait for a free connection instead of opening extra
+          connections that would be thrown away after the request.
+    """
+
+    def __init__(self, pool_size=10, timeout=(3.05, 30), retries=3, backoff=0.2):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            pool_block=True,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=backoff,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=frozenset({"GET", "PUT"}),
+                raise_on_status=False,
+            ),
+        )
+        self._local = local()
+
+    @property
+    def session(self):
+        """requests.Session: The calling thread's session, mounted on the shared adapter."""
+
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self.adapter)
+            session.mount("https://", self.adapter)
+            self._local.session = session
+        return session
+
+    def request(self, method, url, **kwargs):
+        """Sends a request through the pool, applying the default timeout."""
+
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        """Sends a GET request through the pool."""
+
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, retry=False, **kwargs):
+        """
+        Sends a POST request through the pool.
+
+        Args:
+            url (str): The URL.
+            retry (bool): Retry read errors, timeouts and 502/503/504 responses as for a GET. Only
+                for POST endpoints without side effects, such as `/question/batch`.
+            **kwargs: Passed to `requests`.
+
+        Returns:
+            requests.Response: The last response received.
+        """
+
+        attempts = self.retries + 1 if retry else 1
+        for attempt in range(attempts):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            last_attempt = attempt == attempts - 1
+            try:
+                response = self.request("POST", url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if last_attempt:
+                    raise
+                continue
+            if response.status_code not in RETRY_STATUSES or last_attempt:
+                return response
+
+    def close(self):
+        """Closes every pooled connection."""
+
+        self.adapter.close()
+
+
+class HttpDataSource:
+    """
+    Fetches receiver data from the FastAPI service.
+
+    Args:
+        presentation_files_url (str): Base URL of the knowledgebase files endpoint.
+        question_url (str): Base URL of the question endpoint.
+        client (PooledHttpClient, optional): HTTP client to use; a default one is created when omitted.
+    """
+
+    def __init__(self, presentation_files_url, question_url, client=None):
+        self.presentation_files_url = presentation_files_url
+        self.question_url = question_url
+        self.client = client or PooledHttpClient()
+
+    def _get(self, url):
+        response = self.client.get(url)
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} failed: {response.status_code}, {response.text}")
+        return response.json()
+
+    def fetch_presentation_files(self, presentation_id):
+        """Returns the files of a presentation, or None if it has none."""
+
+        data = self._get(f"{self.presentation_files_url}/{presentation_id}")
+        return None if data is None else data.get('files', [])
+
+    def fetch_question(self, question_id):
+        """Returns a question, or None if it does not exist."""
+
+        return self._get(f"{self.question_url}/{question_id}")
+
+    def fetch_questions(self, question_ids):
+        """Returns the existing questions among `question_ids`, keyed by ID, in one request."""
+
+        url = f"{self.question_url}/batch"
+        response = self.client.post(url, retry=True, json={"question_ids": list(question_ids)})
+        if response.status_code != 200:
+            raise RuntimeError(f"POST {url} failed: {response.status_code}, {response.text}")
+        return response.json()["questions"]
+
+    def close(self):
+        """Closes the pooled HTTP connections."""
+
+        self.client.close()
+
+
+class DirectDataSource:
+    """
+    Runs the repository queries in-process.
+
+    Actions:
+        - Starts a background event loop thread that owns the `database` connection pool.
+        - Blocks the calling worker thread until the query coroutine completes on that loop.
+
+    Notes:
+        - Needs direct access to the MySQL database configured in `database.py`.
+    """
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = Thread(target=self._loop.run_forever, name="direct-data-source", daemon=True)
+        self._thread.start()
+        self._run(database.connect())
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def fetch_presentation_files(self, presentation_id):
+        """Returns the files of a presentation, or None if it has none."""
+
+        try:
+            files = self._run(repository.get_presentation_files(presentation_id))
+        except ValueError:  # not a UUID, so no such presentation
+            return None
+        return files or None
+
+    def fetch_question(self, question_id):
+        """Returns a question, or None if it does not exist."""
+
+        try:
+            return self._run(repository.get_question(question_id))
+        except ValueError:  # not a UUID, so no such question
+            return None
+
+    def fetch_questions(self, question_ids):
+        """Returns the existing questions among `question_ids`, keyed by ID, in one query."""
+
+        return self._run(repository.get_questions(question_ids))
+
+    def close(self):
+        """Disconnects the database pool and stops the background loop."""
+
+        self._run(database.disconnect())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+class _Batch:
+    """Lookups collected for one `fetch_many` call."""
+
+    def __init__(self):
+        self.keys = []
+        self.full = Event()
+        self.done = Event()
+        self.results = None
+        self.error = None
+        self.single = False
+
+
+class BatchLoader:
+    """
+    Merges lookups made concurrently by worker threads into batched lookups.
+
+    Args:
+        fetch_many (callable): Called with a list of distinct keys; returns a dict of the found
+            values keyed by key.
+        max_batch (int): Keys that close a batch immediately.
+        max_delay (float): Seconds the first caller of a batch waits for others to join it.
+        fetch_one (callable, optional): Called with a single key when its batch failed; returns the
+            value or None. Defaults to `fetch_many` with that key alone.
+        timeout (float): Seconds a lookup waits for the result of a batch another thread is
+            fetching, once the batch is closed.
+
+    Notes:
+        - The thread that opens a batch runs `fetch_many` for everyone once the batch is full or
+          `max_delay` has passed; the other threads wait for its result.
+        - If `fetch_many` raises, each lookup of the batch fetches its own key again with
+          `fetch_one`, so one bad key or one failed request does not fail every lookup merged
+          with it. A batch of a single key raises the error as is.
+        - A lookup whose batch result does not arrive within `timeout` raises `TimeoutError`
+          rather than holding its thread for as long as `fetch_many` hangs.
+    """
+
+    def __init__(self, fetch_many, max_batch, max_delay, fetch_one=None, timeout=60):
+        self.fetch_many = fetch_many
+        self.fetch_one = fetch_one or (lambda key: self.fetch_many([key]).get(key))
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self._lock = Lock()
+        self._open = None
+
+    def load(self, key):
+        """
+        Looks up one key as part of the current batch.
+
+        Returns:
+            The value found for `key`, or None if it does not exist.
+
+        Raises:
+            TimeoutError: If the batch fetched by another thread did not finish in time.
+        """
+
+        with self._lock:
+            batch = self._open
+            leader = batch is None
+            if leader:
+                batch = self._open = _Batch()
+            batch.keys.append(key)
+            if len(batch.keys) >= self.max_batch:
+                self._open = None
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.max_delay)
+            with self._lock:
+                if self._open is batch:
+                    self._open = None
+                keys = list(dict.fromkeys(batch.keys))
+            try:
+                batch.results = self.fetch_many(keys)
+            except Exception as e:
+                batch.error = e
+                batch.single = len(keys) == 1
+            batch.done.set()
+        else:
+            batch.full.wait(self.max_delay)  # the batch closes when full or after `max_delay`
+            if not batch.done.wait(self.timeout):
+                raise TimeoutError(f"Batched lookup of {key!r} did not finish within {self.timeout} seconds")
+
+        if batch.error is None:
+            return batch.results.get(key)
+        if batch.single:
+            raise batch.error
+        return self.fetch_one(key)
@@ -0,0 +1,379 @@
+"""
+Extraction Executor Module
+
+This module runs text extraction in a pool of worker processes. PyPDF2, python-pptx and odfpy
+parsing is pure Python and CPU-bound, so threads would serialize on the GIL; processes let the
+files of a presentation use every core assigned to the consumer.
+
+Features:
+- `ExtractionExecutor`: process pool with warm workers (parsers imported before the first file)
+  and a bounded number of pending files, so a burst of messages cannot queue unbounded work.
+- Results come back to the consumer as `concurrent.futures.Future` objects.
+- Workers read and fill the shared on-disk `ExtractionCache`, so repeated files skip parsing.
+- Each file is memory-mapped once in the worker; the same buffer is hashed for the cache, sniffed for
+  its format and parsed.
+- Per-file wall-clock and memory budgets: workers stream their text back page by page, and a file
+  that runs past `EXTRACTION_TIMEOUT` or `EXTRACTION_MAX_RSS_MB` has its worker killed and replaced.
+  Its future fails with `ExtractionAborted`, which carries the text extracted so far; so does a file
+  whose worker crashes.
+
+Attributes:
+    EXTRACTION_PROCESSES (int): Extraction processes per consumer; defaults to the cores left per
+        consumer worker (`cpu_count // CONSUMER_WORKERS`), at least one.
+    EXTRACTION_QUEUE_SIZE (int): Maximum files submitted and not yet extracted per consumer.
+    EXTRACTION_TIMEOUT (float): Wall-clock budget of one file, in seconds; 0 disables it.
+    EXTRACTION_MAX_RSS_MB (int): Anonymous resident memory budget of a worker while it extracts a
+        file, in megabytes (the mapped input file is not counted); 0 disables it. Measured from
+        `/proc`, so only enforced on Linux.
+"""
+
+import multiprocessing
+import os
+import queue
+import signal
+import time
+from concurrent.futures import Future
+from threading import BoundedSemaphore, Thread
+
+from Qtip_fapi.extraction_cache import EXTRACTION_CACHE_MAX_BYTES, ExtractionCache
+from Qtip_fapi.sources import map_file
+from Qtip_fapi.textExtract import find_extractor, preload_extractors
+from Qtip_fapi.worker_supervisor import CONSUMER_WORKERS
+
+EXTRACTION_PROCESSES = int(os.environ.get(
+    "EXTRACTION_PROCESSES", max(1, (os.cpu_count() or 1) // CONSUMER_WORKERS)
+))
+EXTRACTION_QUEUE_SIZE = int(os.environ.get("EXTRACTION_QUEUE_SIZE", EXTRACTION_PROCESSES * 4))
+EXTRACTION_TIMEOUT = float(os.environ.get("EXTRACTION_TIMEOUT", 120))
+EXTRACTION_MAX_RSS_MB = int(os.environ.get("EXTRACTION_MAX_RSS_MB", 1024))
+
+_POLL_INTERVAL = 0.1
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+_cache = None
+
+
+class ExtractionAborted(Exception):
+    """
+    Raised by an extraction future when the worker was killed or died before finishing the file.
+
+    Attributes:
+        file_path (str): The file being extracted.
+        reason (str): `"time"` or `"memory"` for an exceeded budget, `"crash"` if the worker died.
+        partial_text (str): The text extracted before the worker stopped.
+    """
+
+    def __init__(self, file_path, reason, partial_text):
+        super().__init__(f"Extraction of {file_path} aborted ({reason}), {len(partial_text)} characters kept")
+        self.file_path = file_path
+        self.reason = reason
+        self.partial_text = partial_text
+
+
+def _warm_up():
+    """Imports the parsers and opens the cache in a new worker so the first file does not pay for it."""
+
+    global _cache
+    preload_extractors()
+    if EXTRACTION_CACHE_MAX_BYTES > 0:
+        _cache = ExtractionCache(temp_max_age=EXTRACTION_TIMEOUT or 3600)
+
+
+def extract_text_streaming(file_path, send, start=None):
+    """
+    Extracts a file through the worker's extraction cache, passing each piece of text to `send`.
+
+    Args:
+        file_path (str): The path to the file.
+        send (callable): Called with every page, slide or paragraph as soon as it is parsed; a cache
+            hit is sent as a single piece.
+        start (callable, optional): Called with the separator the pieces are joined with, once the
+            format is known and before the first piece.
+
+    Returns:
+        str: The separator the pieces are joined with.
+    """
+
+    with map_file(file_path) as data:
+        extractor = find_extractor(data, file_path)
+        if start is not None:
+            start(extractor.separator)
+        streamed = []
+
+        def extract(source):
+            for item in extractor.iter_text(source):
+                streamed.append(item)
+                send(item)
+            return extractor.separator.join(streamed)
+
+        if _cache is None:
+            extract(data)
+        else:
+            text = _cache.extract(data, extract, extractor.cache_format)
+            if not streamed and text:
+                send(text)
+    return extractor.separator
+
+
+def _worker_main(connection):
+    """
+    Entry point of an extraction process: extracts the files received on `connection` one at a time.
+
+    Notes:
+        - Sends `("ready", pid)` once warm, then for each file `("start", separator)` once its format
+          is known, `("chunk", text)` messages, and `("done", separator)` or `("error", exception)`.
+          A `None` file path stops the worker.
+        - Ignores SIGINT: on Ctrl+C the whole process group gets it, and a worker dying mid-file
+          would be reported as a crash whose partial text is kept. The consumer stops its workers
+          through `ExtractionExecutor.shutdown` instead.
+    """
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _warm_up()
+    connection.send(("ready", os.getpid()))
+    while True:
+        file_path = connection.recv()
+        if file_path is None:
+            return
+        try:
+            separator = extract_text_streaming(
+                file_path,
+                lambda text: connection.send(("chunk", text)),
+                lambda separator: connection.send(("start", separator)),
+            )
+        except Exception as e:
+            try:
+                connection.send(("error", e))
+            except Exception:  # the exception does not pickle
+                connection.send(("error", RuntimeError(repr(e))))
+        else:
+            connection.send(("done", separator))
+
+
+def _rss_bytes(pid):
+    """
+    Returns the anonymous resident memory of a process from `/proc`, or None where it is not available.
+
+    Notes:
+        - File-backed pages are left out: the input file is memory-mapped and read in full for
+          hashing, so counting it would kill workers over a large but harmless file. The kernel can
+          drop those pages at any time; the parser's heap is what the budget is for.
+        - Reads `RssAnon` from `/proc/<pid>/status`, or resident minus shared pages from
+          `/proc/<pid>/statm` on kernels without it.
+    """
+
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1]) * 1024
+        with open(f"/proc/{pid}/statm") as statm:
+            fields = statm.read().split()
+        return (int(fields[1]) - int(fields[2])) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _WorkerSlot(Thread):
+    """
+    Feeds one extraction process from the executor's queue and enforces the per-file budgets.
+
+    Notes:
+        - The process is started on first use and restarted after it is killed or dies.
+    """
+
+    def __init__(self, executor, index):
+        super().__init__(name=f"extraction-slot-{index}", daemon=True)
+        self.executor = executor
+        self.process = None
+        self.connection = None
+
+    def ensure_process(self):
+        """Starts the extraction process if needed and waits until it is warm."""
+
+        if self.process is not None and self.process.is_alive():
+            return
+        self.connection, child_connection = self.executor.context.Pipe()
+        self.process = self.executor.context.Process(
+            target=_worker_main, args=(child_connection,), name="extraction-worker", daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+        self.connection.recv()  # ("ready", pid)
+
+    def kill_process(self):
+        if self.process is None:
+            return
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+        self.process = None
+
+    def stop_process(self):
+        if self.process is None:
+            return
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill_process()
+        else:
+            self.connection.close()
+            self.process = None
+
+    def run(self):
+        while True:
+            job = self.executor._jobs.get()
+            if job is None:
+                self.stop_process()
+                return
+            file_path, future = job
+            if future.set_running_or_notify_cancel():
+                try:
+                    self.extract(file_path, future)
+                except BaseException as e:  # worker could not be started or the pipe broke
+                    self.kill_process()
+                    future.set_exception(e)
+
+    def extract(self, file_path, future):
+        """Runs one file in the worker process, killing it if the file goes over budget."""
+
+        self.ensure_process()
+        self.connection.send(file_path)
+        started = last_check = time.monotonic()
+        separator = ""
+        chunks = []
+        while True:
+            if self.connection.poll(_POLL_INTERVAL):
+                try:
+                    kind, payload = self.connection.recv()
+                except EOFError:
+                    kind, payload = "crash", None
+                if kind == "start":
+                    separator = payload
+                elif kind == "chunk":
+                    chunks.append(payload)
+                elif kind == "done":
+                    future.set_result(payload.join(chunks))
+                    return
+                elif kind == "error":
+                    future.set_exception(payload)
+                    return
+                else:
+                    self.abort(file_path, future, "crash", separator.join(chunks), started)
+                    return
+
+            now = time.monotonic()
+            if now - last_check >= _POLL_INTERVAL:
+                last_check = now
+                reason = self.executor.over_budget(self.process.pid, now - started)
+                if reason:
+                    self.abort(file_path, future, reason, separator.join(chunks), started)
+                    return
+
+    def abort(self, file_path, future, reason, partial_text, started):
+        """Kills the worker and fails the file's future with the text streamed so far."""
+
+        self.kill_process()
+        print(f"Extraction of {file_path} aborted ({reason}) after {time.monotonic() - started:.1f}s; "
+              f"worker replaced, kept {len(partial_text)} characters.")
+        future.set_exception(ExtractionAborted(file_path, reason, partial_text))
+
+
+class ExtractionExecutor:
+    """
+    Process pool dedicated to text extraction.
+
+    Args:
+        processes (int): Number of worker processes.
+        max_pending (int): Maximum files submitted and not yet finished; `submit` blocks beyond it.
+        timeout (float): Wall-clock budget of one file, in seconds; 0 disables it.
+        max_rss_mb (int): Resident memory budget of a worker during one file, in megabytes; 0 disables it.
+    """
+
+    def __init__(self, processes=EXTRACTION_PROCESSES, max_pending=EXTRACTION_QUEUE_SIZE,
+                 timeout=EXTRACTION_TIMEOUT, max_rss_mb=EXTRACTION_MAX_RSS_MB):
+        self.processes = max(1, processes)
+        self.timeout = timeout
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self.context = multiprocessing.get_context("spawn")
+        self._slots = BoundedSemaphore(max(self.processes, max_pending))
+        self._jobs = queue.SimpleQueue()
+        self._workers = [_WorkerSlot(self, index) for index in range(self.processes)]
+        for worker in self._workers:
+            worker.start()
+
+    def over_budget(self, pid, elapsed):
+        """
+        Tells which budget, if any, a worker running a file for `elapsed` seconds has exceeded.
+
+        Returns:
+            str: `"time"` or `"memory"`, or None while the file is within budget.
+        """
+
+        if self.timeout and elapsed > self.timeout:
+            return "time"
+        if self.max_rss_bytes:
+            rss = _rss_bytes(pid)
+            if rss is not None and rss > self.max_rss_bytes:
+                return "memory"
+        return None
+
+    def warm_up(self):
+        """
+        Starts every worker process and waits until all of them are ready.
+        """
+
+        for worker in self._workers:
+            worker.ensure_process()
+
+    def submit(self, file_path):
+        """
+        Queues a file for extraction.
+
+        Args:
+            file_path (str): The path to the file.
+
+        Returns:
+            Future: Resolves to the extracted text, or raises the extraction error, or
+                `ExtractionAborted` (with the partial text) if the file went over budget.
+
+        Notes:
+            - Blocks while `max_pending` files are already queued.
+        """
+
+        self._slots.acquire()
+        future = Future()
+        future.add_done_callback(lambda _: self._slots.release())
+        self._jobs.put((file_path, future))
+        return future
+
+    def extract(self, file_path):
+        """Extracts a file in the pool and waits for the text."""
+
+        return self.submit(file_path).result()
+
+    def shutdown(self, wait=True):
+        """
+        Stops the worker processes.
+
+        Args:
+            wait (bool): Finish the queued files first; otherwise cancel them and kill the workers
+                once their current file is done.
+        """
+
+        if not wait:
+            while True:
+                try:
+                    job = self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if job is not None:
+                    job[1].cancel()
+        for _ in self._workers:
+            self._jobs.put(None)
+        if wait:
+            for worker in self._workers:
+                worker.join()
@@ -0,0 +1,222 @@
+"""
+Extraction Cache Module
+
+This module keeps extracted text on disk, keyed by the content of the source file, so decks and PDFs
+that are submitted again (e.g. when a presenter restarts a session) are read back instead of re-parsed.
+
+Features:
+- Keys combine the SHA-256 of the file content, the file format (with the extraction mode where it
+  changes the text, see `Extractor.cache_format`) and `PARSER_VERSION`, so renamed copies hit the
+  cache and parser changes invalidate it.
+- Entries are read back exactly as written: line breaks (`\r`, `\r\n`) are not translated.
+- Size-bounded LRU eviction: hits refresh the entry's modification time and the oldest entries are
+  removed once the directory grows past its budget.
+- Safe to share between processes: entries are written to a temporary file and atomically renamed,
+  and eviction tolerates entries removed concurrently by another process. Temporary files left by a
+  worker killed mid-write are removed by eviction once they are older than `temp_max_age`.
+
+Attributes:
+    EXTRACTION_CACHE_DIR (str): Directory holding the cache entries.
+    EXTRACTION_CACHE_MAX_BYTES (int): Size budget of the cache directory; 0 disables the cache.
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+
+from Qtip_fapi.sources import is_path
+from Qtip_fapi.textExtract import PARSER_VERSION
+
+EXTRACTION_CACHE_DIR = os.environ.get(
+    "EXTRACTION_CACHE_DIR", os.path.join(tempfile.gettempdir(), "qtip_extraction_cache")
+)
+EXTRACTION_CACHE_MAX_BYTES = int(os.environ.get("EXTRACTION_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+_ENTRY_SUFFIX = ".txt"
+_TEMP_SUFFIX = ".tmp"
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path):
+    """
+    Computes the SHA-256 of a file's content.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Returns:
+        str: Hex digest of the content.
+    """
+
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_source(source):
+    """
+    Computes the SHA-256 of an extraction source.
+
+    Args:
+        source (str or bytes-like): A file path, or the file content (`bytes`, `memoryview`, `mmap`),
+            which is hashed in place without copying.
+
+    Returns:
+        str: Hex digest of the content.
+    """
+
+    if is_path(source):
+        return hash_file(source)
+    return hashlib.sha256(source).hexdigest()
+
+
+class ExtractionCache:
+    """
+    On-disk cache of extracted text.
+
+    Args:
+        directory (str): Directory holding the cache entries; created if missing.
+        max_bytes (int): Size budget; the least recently used entries are evicted beyond it.
+        evict_every (int): Number of writes between two scans of the directory size.
+        temp_max_age (float): Seconds after which a temporary file is known to be abandoned by a
+            killed writer; the extraction executor passes its per-file time budget.
+    """
+
+    def __init__(self, directory=EXTRACTION_CACHE_DIR, max_bytes=EXTRACTION_CACHE_MAX_BYTES, evict_every=16,
+                 temp_max_age=3600):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.evict_every = max(1, evict_every)
+        self.temp_max_age = temp_max_age
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(content_hash, file_format):
+        """
+        Builds the cache key of a file.
+
+        Args:
+            content_hash (str): SHA-256 of the file content.
+            file_format (str): Format the file is parsed as (e.g. its extractor's `cache_format`, or
+                its extension).
+
+        Returns:
+            str: The cache key, usable as a file name.
+        """
+
+        file_format = file_format.lstrip('.').lower() or "unknown"
+        return f"{content_hash}-{file_format}-v{PARSER_VERSION}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + _ENTRY_SUFFIX)
+
+    def get(self, key):
+        """
+        Reads an entry and marks it as recently used.
+
+        Returns:
+            str: The cached text, or None on a miss.
+        """
+
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8', newline='') as entry:
+                text = entry.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return text
+
+    def put(self, key, text):
+        """
+        Stores an entry, then evicts old entries if the cache is over budget.
+        """
+
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=_TEMP_SUFFIX)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as entry:
+                entry.write(text)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+        self._writes += 1
+        if self._writes % self.evict_every == 0 or len(text) > self.max_bytes // self.evict_every:
+            self.evict()
+
+    def evict(self):
+        """
+        Removes abandoned temporary files, then the least recently used entries until the cache fits
+        in `max_bytes`.
+
+        Notes:
+            - Temporary files still being written count towards the size but are never removed.
+        """
+
+        entries = []
+        total = 0
+        abandoned_before = time.time() - self.temp_max_age
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                is_temp = entry.name.endswith(_TEMP_SUFFIX)
+                if not is_temp and not entry.name.endswith(_ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                    if is_temp and stat.st_mtime < abandoned_before:
+                        os.remove(entry.path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                total += stat.st_size
+                if not is_temp:
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def extract(self, source, extract, file_format=None):
+        """
+        Returns the text of a file from the cache, extracting and storing it on a miss.
+
+        Args:
+            source (str or bytes-like): The path to the file, or its content.
+            extract (callable): `extract(source)` used on a miss.
+            file_format (str, optional): Format the file is parsed as, including the extraction mode
+                if it changes the text; defaults to the extension of a path.
+
+        Returns:
+            str: The extracted text.
+
+        Notes:
+            - Empty results are not stored, so a failed parse is retried next time.
+            - Pass the content of a mapped file to hash and parse it from a single read.
+        """
+
+        if file_format is None:
+            file_format = os.path.splitext(source)[1] if is_path(source) else ""
+        key = self.key(hash_source(source), file_format)
+        text = self.get(key)
+        if text is not None:
+            return text
+        text = extract(source)
+        if text:
+            self.put(key, text)
+        return text
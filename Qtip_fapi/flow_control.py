@@ -0,0 +1,163 @@
+"""
+Flow Control Module
+
+This module holds the bookkeeping shared by the threaded and asyncio RabbitMQ consumers to keep
+the number of unacknowledged deliveries in line with the worker capacity.
+
+Features:
+- `InFlightWindow`: per-queue in-flight accounting. The window size is used as the queue's
+  `basic_qos` prefetch count and the executor is sized to the sum of all windows, so the broker
+  never delivers more messages than the pool can work on at once.
+- `AckBatcher`: acknowledges deliveries only after their processing finished, coalescing them
+  into `basic_ack(multiple=True)` frames flushed on a size or time threshold.
+
+Attributes:
+    None
+"""
+
+from collections import OrderedDict
+from threading import Lock
+
+
+class InFlightWindow:
+    """
+    Counts the deliveries of one queue that are being processed and not yet settled.
+
+    Args:
+        queue (str): Name of the queue the window belongs to.
+        size (int): Maximum number of deliveries in flight; also the prefetch count.
+
+    Notes:
+        - Thread-safe: slots are taken on the connection thread and released from workers.
+        - `acquire` never blocks. It only fails if the broker delivers beyond the prefetch
+          window, in which case the caller should requeue the message.
+    """
+
+    def __init__(self, queue, size):
+        if size < 1:
+            raise ValueError(f"Prefetch window for '{queue}' must be at least 1, got {size}")
+        self.queue = queue
+        self.size = size
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = Lock()
+
+    def acquire(self):
+        """
+        Takes a slot for a new delivery.
+
+        Returns:
+            bool: True if a slot was free, False if the window is already full.
+        """
+
+        with self._lock:
+            if self.in_flight >= self.size:
+                return False
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            return True
+
+    def release(self):
+        """Frees the slot of a settled delivery."""
+
+        with self._lock:
+            if self.in_flight == 0:
+                raise RuntimeError(f"In-flight window for '{self.queue}' released more than acquired")
+            self.in_flight -= 1
+
+    @property
+    def available(self):
+        """int: Number of deliveries the window can still accept."""
+
+        with self._lock:
+            return self.size - self.in_flight
+
+    def __repr__(self):
+        return f"InFlightWindow(queue={self.queue!r}, in_flight={self.in_flight}, size={self.size})"
+
+
+class AckBatcher:
+    """
+    Coalesces the acknowledgements of one channel into `multiple=True` acks.
+
+    Args:
+        channel: The pika channel the deliveries arrived on.
+        call_later (callable): `call_later(delay, callback)` of the connection's IO loop, used
+            to flush on the time threshold.
+        batch_size (int): Number of finished deliveries that triggers a flush.
+        max_delay (float): Seconds a finished delivery may wait before it is acknowledged.
+
+    Notes:
+        - Not thread-safe: every method must run on the connection's thread.
+        - A multi-ack covers a delivery tag and all earlier ones, so it can only reach up to the
+          first delivery still being processed. Finished deliveries behind a slow one are acked
+          one by one on flush, so a single slow message never holds back the prefetch window.
+        - Rejections (`nack`) are sent immediately and never batched.
+    """
+
+    def __init__(self, channel, call_later, batch_size=16, max_delay=0.2):
+        self.channel = channel
+        self.call_later = call_later
+        self.batch_size = max(1, batch_size)
+        self.max_delay = max_delay
+        self._outstanding = OrderedDict()
+        self._finished = 0
+        self._timer_pending = False
+
+    def track(self, delivery_tag):
+        """Registers a new delivery, in delivery order."""
+
+        self._outstanding[delivery_tag] = False
+
+    def ack(self, delivery_tag):
+        """Marks a delivery as processed; it is acknowledged on the next flush."""
+
+        self._outstanding[delivery_tag] = True
+        self._finished += 1
+        if self._finished >= self.batch_size:
+            self.flush()
+        elif not self._timer_pending:
+            self._timer_pending = True
+            self.call_later(self.max_delay, self._on_timer)
+
+    def nack(self, delivery_tag, requeue):
+        """Rejects a delivery right away."""
+
+        del self._outstanding[delivery_tag]
+        if self.channel.is_open:
+            self.channel.basic_nack(delivery_tag=delivery_tag, requeue=requeue)
+
+    def flush(self):
+        """
+        Acknowledges every processed delivery.
+
+        Actions:
+            - Sends one `multiple=True` ack for the leading run of processed deliveries.
+            - Sends single acks for processed deliveries queued behind unfinished ones.
+        """
+
+        if not self._finished:
+            return
+        if not self.channel.is_open:
+            self._outstanding.clear()
+            self._finished = 0
+            return
+
+        last_contiguous = None
+        while self._outstanding:
+            delivery_tag, done = next(iter(self._outstanding.items()))
+            if not done:
+                break
+            self._outstanding.popitem(last=False)
+            last_contiguous = delivery_tag
+        if last_contiguous is not None:
+            self.channel.basic_ack(delivery_tag=last_contiguous, multiple=True)
+
+        for delivery_tag in [tag for tag, done in self._outstanding.items() if done]:
+            del self._outstanding[delivery_tag]
+            self.channel.basic_ack(delivery_tag=delivery_tag)
+        self._finished = 0
+
+    def _on_timer(self):
+        self._timer_pending = False
+        self.flush()
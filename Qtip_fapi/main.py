@@ -7,17 +7,19 @@ It also handles application startup and shutdown events, ensuring proper resourc
 Modules and Features:
 - Includes FastAPI routers for handling specific API endpoints (knowledgebase and Question).
 - Connects to the database on application startup and disconnects on shutdown.
-- Starts the RabbitMQ consumer process for message handling.
+- Starts a supervised pool of RabbitMQ consumer processes for message handling.
 
 Attributes:
     app (FastAPI): The FastAPI application instance.
+    consumer_supervisor (WorkerSupervisor): Supervisor of the RabbitMQ consumer worker processes.
 
 Endpoints:
     - GET `/`: A root endpoint to test if the app is running, returning a welcome message.
+    - GET `/metrics/db-pool`: Database pool occupancy and the time queries waited for a connection.
 
 Event Handlers:
-    - `startup`: Establishes the database connection and starts the RabbitMQ consumer on application startup.
-    - `shutdown`: Closes the database connection when the server shuts down.
+    - `startup`: Establishes the database connection and starts the RabbitMQ consumer workers on application startup.
+    - `shutdown`: Drains the consumer workers and closes the database connection when the server shuts down.
 
 Usage:
     Run this file to start the FastAPI application and initialize required services (database and RabbitMQ).
@@ -25,14 +27,14 @@ Usage:
 
 
 from fastapi import FastAPI
-from Qtip_fapi.database import database
+from Qtip_fapi.database import database, pool_metrics
 from Qtip_fapi.routers import knowledgebase
 from Qtip_fapi.routers import Question
+from Qtip_fapi.worker_supervisor import WorkerSupervisor
 import asyncio
-import subprocess
-import os
 
 app = FastAPI()
+consumer_supervisor = WorkerSupervisor()
 
 app.include_router(knowledgebase.router)
 app.include_router(Question.router)
@@ -50,15 +52,14 @@ async def startup():
     except Exception as e:
         print(f"Database connection failed: {e}")
 
-    # Start RabbitMQ consumer
-    loop = asyncio.get_event_loop()
-    receiver_path = os.path.join(os.path.dirname(__file__), "receiver.py")
-    loop.run_in_executor(None, subprocess.run, ["python", receiver_path])
+    # Start RabbitMQ consumer workers
+    consumer_supervisor.start()
 
 
 @app.on_event("shutdown")
 async def shutdown():
-    """To close connection with db."""
+    """To drain the RabbitMQ consumer workers & close connection with db."""
+    await asyncio.get_event_loop().run_in_executor(None, consumer_supervisor.stop)
     await database.disconnect()
 
 
@@ -66,3 +67,9 @@ async def shutdown():
 async def root():
     """/,endpoint to test app."""
     return {"message": "Welcome to FastAPI with MySQL"}
+
+
+@app.get("/metrics/db-pool")
+async def db_pool_metrics():
+    """/metrics/db-pool,endpoint to watch the db connection pool (sizing & wait times)."""
+    return pool_metrics.snapshot()
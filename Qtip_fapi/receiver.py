@@ -9,32 +9,101 @@ Features:
 - Uses `pika` for RabbitMQ messaging.
 - Utilizes `ThreadPoolExecutor` for handling tasks asynchronously.
 - Implements multithreading to run multiple consumers in parallel.
-- Fetches data from FastAPI endpoints for further processing.
-- Handles graceful shutdown on keyboard interruption.
+- Fetches data from FastAPI endpoints, or straight from the database with `DATA_ACCESS_MODE=direct`
+  (see `data_access.py`), for further processing.
+- Handles graceful shutdown on keyboard interruption and SIGTERM: consumers stop, in-flight
+  messages finish and are acknowledged before the connections close.
+- Optional asyncio mode (`CONSUMER_MODE=asyncio`) that runs both queues on one event loop
+  with configurable concurrency per queue (see `async_consumer.py`).
+- Per-queue prefetch windows: each queue keeps up to its window of deliveries in flight and the
+  thread pool has exactly one worker per window slot.
+- At-least-once delivery: messages are acknowledged only after processing finished, in
+  `basic_ack(multiple=True)` batches flushed on a size or time threshold.
+- Question micro-batching: the question lookups of a burst of `question_Queue` deliveries are merged
+  into one `fetch_questions` call (`POST /question/batch`, or one query in direct mode).
 
 Attributes:
     RABBITMQ_HOST (str): The hostname for RabbitMQ.
     START_LEARNING_QUEUE (str): Queue name for processing "start learning" tasks.
     QUESTION_QUEUE (str): Queue name for processing "question" tasks.
+    CONSUMER_MODE (str): `threaded` (one blocking connection per queue) or `asyncio`.
+    PREFETCH_WINDOWS (dict): Prefetch count, i.e. deliveries kept in flight, per queue.
+    ACK_BATCH_SIZE (int): Number of processed deliveries that triggers an ack flush.
+    ACK_FLUSH_INTERVAL (float): Seconds a processed delivery may wait for its ack.
+    DATA_ACCESS_MODE (str): `http` (FastAPI endpoints) or `direct` (in-process repository queries).
+    QUESTION_BATCH_SIZE (int): Question lookups merged into one batch; 1 fetches each question alone.
+        Must not exceed the API's `QUESTION_BATCH_MAX`.
+    QUESTION_BATCH_DELAY (float): Seconds the first lookup of a batch waits for others to join it.
+    QUESTION_BATCH_TIMEOUT (float): Seconds a lookup waits for a batch fetched by another thread
+        before its delivery is requeued.
     GET_PRESENTATION_FILES (str): FastAPI endpoint to fetch presentation file paths.
     GET_QUESTION_BODY (str): FastAPI endpoint to fetch question details.
-    executor (ThreadPoolExecutor): Thread pool executor for asynchronous task handling.
+    HTTP_POOL_SIZE (int): Keep-alive connections to the FastAPI service; defaults to one per pool worker.
+    HTTP_CONNECT_TIMEOUT (float): Seconds allowed to open a connection to the FastAPI service.
+    HTTP_READ_TIMEOUT (float): Seconds allowed for the FastAPI service to answer.
+    HTTP_RETRIES (int): Retries for connection errors and 502/503/504 responses.
+    HTTP_RETRY_BACKOFF (float): Backoff factor between retries.
+    data_source (HttpDataSource | DirectDataSource): Data source used by the handlers, set by `main`.
+    executor (ThreadPoolExecutor): Thread pool executor sized to the sum of all prefetch windows.
+    extraction_executor (ExtractionExecutor): Process pool running the CPU-bound text extraction, set
+        by `main`, so importing the module starts no threads or processes.
+    question_loader (BatchLoader): Merges concurrent question lookups into `fetch_questions` calls.
+    in_flight (dict): `InFlightWindow` accounting per queue.
+    ack_batchers (dict): `AckBatcher` of each queue's channel, set when the consumer starts.
+    connections (dict): `(connection, channel)` of each threaded consumer, used to stop them.
+    stopping (Event): Set by `stop_consumers`; consumers that have not started consuming yet
+        close without consuming.
 """
 
-import pika, sys, os, requests
+import pika, sys, os, signal
 from concurrent.futures import ThreadPoolExecutor
-from textExtract import extract_text
-from threading import Thread
+from Qtip_fapi.extraction import ExtractionAborted, ExtractionExecutor
+from Qtip_fapi.async_consumer import AsyncConsumer
+from Qtip_fapi.data_access import BatchLoader, DirectDataSource, HttpDataSource, PooledHttpClient
+from Qtip_fapi.flow_control import AckBatcher, InFlightWindow
+from functools import partial
+from threading import Event, Lock, Thread
 
 RABBITMQ_HOST = 'localhost'
 START_LEARNING_QUEUE = 'start_learning_Queue'
 QUESTION_QUEUE = 'question_Queue'
 
+CONSUMER_MODE = os.environ.get("CONSUMER_MODE", "threaded")
+PREFETCH_WINDOWS = {
+    START_LEARNING_QUEUE: int(os.environ.get("START_LEARNING_PREFETCH", 4)),
+    QUESTION_QUEUE: int(os.environ.get("QUESTION_PREFETCH", 32)),
+}
+ACK_BATCH_SIZE = int(os.environ.get("ACK_BATCH_SIZE", 16))
+ACK_FLUSH_INTERVAL = float(os.environ.get("ACK_FLUSH_INTERVAL", 0.2))
+
+DATA_ACCESS_MODE = os.environ.get("DATA_ACCESS_MODE", "http")
+QUESTION_BATCH_SIZE = int(os.environ.get("QUESTION_BATCH_SIZE", min(PREFETCH_WINDOWS[QUESTION_QUEUE], 100)))
+QUESTION_BATCH_DELAY = float(os.environ.get("QUESTION_BATCH_DELAY", 0.005))
+QUESTION_BATCH_TIMEOUT = float(os.environ.get("QUESTION_BATCH_TIMEOUT", 60))
+
 # FastAPI API endpoint
 GET_PRESENTATION_FILES = "http://127.0.0.1:8001/knowledgebase"
 GET_QUESTION_BODY = "http://127.0.0.1:8001/question"
 
-executor = ThreadPoolExecutor(max_workers=5)
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", sum(PREFETCH_WINDOWS.values())))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", 3.05))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", 30))
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", 3))
+HTTP_RETRY_BACKOFF = float(os.environ.get("HTTP_RETRY_BACKOFF", 0.2))
+
+data_source = None
+
+executor = ThreadPoolExecutor(max_workers=sum(PREFETCH_WINDOWS.values()))
+extraction_executor = None
+question_loader = BatchLoader(lambda question_ids: data_source.fetch_questions(question_ids),
+                              QUESTION_BATCH_SIZE, QUESTION_BATCH_DELAY,
+                              fetch_one=lambda question_id: data_source.fetch_question(question_id),
+                              timeout=QUESTION_BATCH_TIMEOUT)
+in_flight = {queue: InFlightWindow(queue, size) for queue, size in PREFETCH_WINDOWS.items()}
+ack_batchers = {}
+connections = {}
+stopping = Event()
+_connections_lock = Lock()
 
 
 def process_files(presentation_id, files):
@@ -46,7 +115,11 @@ def process_files(presentation_id, files):
         files (list): List of file information dictionaries containing file paths.
 
     Actions:
-        - Extracts text from the files provided in the `files` list.
+        - Submits every file in the `files` list to the extraction process pool at once, so the
+          presentation takes as long as its slowest file rather than the sum of all files.
+        - Joins the extracted texts in the order of the `files` list.
+        - A file killed for exceeding its extraction time or memory budget is reported and its
+          partial text is kept, so one pathological upload does not hold up the queue.
         - Prints extracted text for debugging.
 
     Note:
@@ -57,17 +130,24 @@ def process_files(presentation_id, files):
     test_file_path = os.path.join(base_dir, "assets", "test.pdf")
 
     extracted_texts = []
+    pending = []
 
     for file_info in files:
         file_path = file_info.get('filepath')
         if file_path:
-            try:
-                text = extract_text(test_file_path)
-                extracted_texts.append(text + "\n")
-            except Exception as e:
-                print(f"Error extracting text from {test_file_path}: {e}")
+            pending.append((test_file_path, extraction_executor.submit(test_file_path)))
         else:
             print("File path not found in file info.")
+
+    for file_path, future in pending:
+        try:
+            extracted_texts.append(future.result() + "\n")
+        except ExtractionAborted as e:
+            print(f"Error extracting text from {file_path}: {e}")
+            if e.partial_text:
+                extracted_texts.append(e.partial_text + "\n")
+        except Exception as e:
+            print(f"Error extracting text from {file_path}: {e}")
     print(extracted_texts)
     print("".join(extracted_texts))
 
@@ -84,6 +164,143 @@ def process_question(question_data):
     print(f"Received a new question: {question_data}")
 
 
+def handle_start_learning_message(body):
+    """
+    Handles one `start_learning_Queue` message from start to finish.
+
+    Args:
+        body (bytes): Message body containing the presentation ID.
+
+    Returns:
+        bool: True once the files were processed, False if the presentation is unknown.
+
+    Notes:
+        - Runs in the thread pool; the message is acknowledged after this returns.
+    """
+
+    presentation_id = body.decode()
+    files = data_source.fetch_presentation_files(presentation_id)
+    if files is None:
+        print(f"Error: no files found for presentation {presentation_id}")
+        return False
+    process_files(presentation_id, files)
+    return True
+
+
+def handle_question_message(body):
+    """
+    Handles one `question_Queue` message from start to finish.
+
+    Args:
+        body (bytes): Message body containing the question ID.
+
+    Returns:
+        bool: True once the question was processed, False if the question is unknown.
+
+    Notes:
+        - Runs in the thread pool; the message is acknowledged after this returns.
+        - The lookup joins the other deliveries' in `question_loader`, so a burst of messages costs
+          one database round trip instead of one per message.
+    """
+
+    question_id = body.decode()
+    if QUESTION_BATCH_SIZE > 1:
+        question = question_loader.load(question_id)
+    else:
+        question = data_source.fetch_question(question_id)
+    if question is None:
+        print(f"Error: no question found for ID {question_id}")
+        return False
+    process_question(question)
+    return True
+
+
+def open_ack_batcher(queue, channel, call_later):
+    """
+    Creates and registers the `AckBatcher` for a queue's channel.
+
+    Args:
+        queue (str): Name of the queue consumed on the channel.
+        channel: The pika channel.
+        call_later (callable): `call_later(delay, callback)` of the connection's IO loop.
+
+    Returns:
+        AckBatcher: The registered batcher.
+
+    Notes:
+        - The batch size never exceeds the prefetch window, otherwise a full window of processed
+          deliveries would only be acked by the timer.
+    """
+
+    batcher = AckBatcher(
+        channel,
+        call_later,
+        batch_size=min(ACK_BATCH_SIZE, PREFETCH_WINDOWS[queue]),
+        max_delay=ACK_FLUSH_INTERVAL,
+    )
+    ack_batchers[queue] = batcher
+    return batcher
+
+
+def settle_delivery(batcher, delivery_tag, window, future):
+    """
+    Acknowledges or rejects a delivery once its handler has finished.
+
+    Args:
+        batcher (AckBatcher): Ack batcher of the channel the message was delivered on.
+        delivery_tag (int): Delivery tag of the message.
+        window (InFlightWindow): In-flight accounting of the message's queue.
+        future (Future): The finished handler task.
+
+    Notes:
+        - Must run on the connection's thread; `dispatch` schedules it there.
+        - Successful deliveries are acked in batches; failures are rejected immediately.
+    """
+
+    window.release()
+    error = future.exception()
+    if error is not None:
+        print(f"Error handling message from '{window.queue}': {error}")
+        batcher.nack(delivery_tag, requeue=True)
+    elif future.result():
+        batcher.ack(delivery_tag)
+    else:
+        batcher.nack(delivery_tag, requeue=False)
+
+
+def dispatch(ch, method, body, handler, window):
+    """
+    Hands a delivery to the thread pool without blocking the connection thread.
+
+    Args:
+        ch: The channel object.
+        method: The delivery method.
+        body (bytes): Message body.
+        handler (callable): `handle_*_message` function to run in the pool.
+        window (InFlightWindow): In-flight accounting of the queue.
+
+    Actions:
+        - Takes an in-flight slot, or requeues the message if the window is full.
+        - Submits the handler to the thread pool.
+        - Settles the message on the connection thread once the handler finishes.
+    """
+
+    if not window.acquire():
+        print(f"In-flight window full for '{window.queue}', requeueing message.")
+        ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+        return
+
+    connection = ch.connection
+    batcher = ack_batchers[window.queue]
+    batcher.track(method.delivery_tag)
+    future = executor.submit(handler, body)
+    future.add_done_callback(
+        lambda f: connection.add_callback_threadsafe(
+            partial(settle_delivery, batcher, method.delivery_tag, window, f)
+        )
+    )
+
+
 def start_learning_callback(ch, method, properties, body):
     """
         RabbitMQ callback function for `start_learning_Queue`.
@@ -95,19 +312,11 @@ def start_learning_callback(ch, method, properties, body):
             body (bytes): Message body containing the presentation ID.
 
         Actions:
-            - Fetches file paths for a given presentation ID via the FastAPI endpoint.
-            - Submits file processing tasks to the thread pool.
-            - Acknowledges message receipt.
+            - Submits `handle_start_learning_message` to the thread pool.
+            - Acknowledges the message once the files have been processed.
         """
 
-    presentation_id = body.decode()
-    response = requests.get(f"{GET_PRESENTATION_FILES}/{presentation_id}")
-    if response.status_code == 200:
-        files = response.json().get('files', [])
-        executor.submit(process_files, presentation_id, files)
-        ch.basic_ack(delivery_tag=method.delivery_tag)
-    else:
-        print(f"Error: {response.status_code}, {response.json()}")
+    dispatch(ch, method, body, handle_start_learning_message, in_flight[START_LEARNING_QUEUE])
 
 
 def question_callback(ch, method, properties, body):
@@ -121,18 +330,31 @@ def question_callback(ch, method, properties, body):
         body (bytes): Message body containing the question ID.
 
     Actions:
-        - Fetches question details for a given question ID via the FastAPI endpoint.
-        - Submits question processing tasks to the thread pool.
-        - Acknowledges message receipt.
+        - Submits `handle_question_message` to the thread pool.
+        - Acknowledges the message once the question has been processed.
     """
 
-    question_id = body.decode()
-    response = requests.get(f"{GET_QUESTION_BODY}/{question_id}")
+    dispatch(ch, method, body, handle_question_message, in_flight[QUESTION_QUEUE])
+
+
+def open_data_source():
+    """
+    Creates the data source selected by `DATA_ACCESS_MODE`.
+
+    Returns:
+        HttpDataSource | DirectDataSource: The data source used by the message handlers.
+    """
+
+    if DATA_ACCESS_MODE == "direct":
+        return DirectDataSource()
+    client = PooledHttpClient(
+        pool_size=HTTP_POOL_SIZE,
+        timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT),
+        retries=HTTP_RETRIES,
+        backoff=HTTP_RETRY_BACKOFF,
+    )
+    return HttpDataSource(GET_PRESENTATION_FILES, GET_QUESTION_BODY, client=client)
 
-    if response.status_code == 200:
-        question = response.json()
-        executor.submit(process_question, question)
-        ch.basic_ack(delivery_tag=method.delivery_tag)
 
 def start_learning_consumer():
     """
@@ -140,7 +362,8 @@ def start_learning_consumer():
 
     Actions:
         - Declares the `start_learning_Queue` queue.
-        - Consumes messages from the queue.
+        - Sets the prefetch count to the queue's in-flight window and opens its ack batcher.
+        - Consumes messages from the queue until `stop_consumers` is called, then drains it.
         - Prints logs indicating consumer activity.
     """
 
@@ -148,11 +371,13 @@ def start_learning_consumer():
     channel = connection.channel()
 
     channel.queue_declare(queue=START_LEARNING_QUEUE, durable=True)
-    channel.basic_qos(prefetch_count=1)
-    channel.basic_consume(queue=START_LEARNING_QUEUE, on_message_callback=start_learning_callback)
-
+    channel.basic_qos(prefetch_count=in_flight[START_LEARNING_QUEUE].size)
+    open_ack_batcher(START_LEARNING_QUEUE, channel, connection.call_later)
+    if not register_consumer(START_LEARNING_QUEUE, connection, channel, start_learning_callback):
+        return
     print(f"Waiting for messages in queue '{START_LEARNING_QUEUE}'...")
     channel.start_consuming()
+    drain_consumer(START_LEARNING_QUEUE)
 
 
 def question_consumer():
@@ -161,7 +386,8 @@ def question_consumer():
 
     Actions:
         - Declares the `question_Queue` queue.
-        - Consumes messages from the queue.
+        - Sets the prefetch count to the queue's in-flight window and opens its ack batcher.
+        - Consumes messages from the queue until `stop_consumers` is called, then drains it.
         - Prints logs indicating consumer activity.
     """
 
@@ -169,11 +395,90 @@ def question_consumer():
     channel = connection.channel()
 
     channel.queue_declare(queue=QUESTION_QUEUE, durable=True)
-    channel.basic_qos(prefetch_count=1)
-    channel.basic_consume(queue=QUESTION_QUEUE, on_message_callback=question_callback)
-
+    channel.basic_qos(prefetch_count=in_flight[QUESTION_QUEUE].size)
+    open_ack_batcher(QUESTION_QUEUE, channel, connection.call_later)
+    if not register_consumer(QUESTION_QUEUE, connection, channel, question_callback):
+        return
     print(f"Waiting for messages in queue '{QUESTION_QUEUE}'...")
     channel.start_consuming()
+    drain_consumer(QUESTION_QUEUE)
+
+
+def register_consumer(queue, connection, channel, callback):
+    """
+    Starts consuming a queue and registers its connection for `stop_consumers`.
+
+    Args:
+        queue (str): Name of the queue.
+        connection: The consumer's `BlockingConnection`.
+        channel: The consumer's channel.
+        callback (callable): The queue's `on_message_callback`.
+
+    Returns:
+        bool: False if shutdown already began; the connection is then closed without consuming.
+
+    Notes:
+        - Runs under the same lock as `stop_consumers`, so a consumer is either registered before
+          the stop request and stopped by it, or sees `stopping` and never consumes.
+    """
+
+    with _connections_lock:
+        if stopping.is_set():
+            connection.close()
+            print(f"Consumer for queue '{queue}' not started: shutting down.")
+            return False
+        channel.basic_consume(queue=queue, on_message_callback=callback)
+        connections[queue] = (connection, channel)
+    return True
+
+
+def drain_consumer(queue):
+    """
+    Settles every in-flight delivery of a stopped threaded consumer and closes its connection.
+
+    Args:
+        queue (str): Name of the queue whose consumer stopped.
+    """
+
+    connection, channel = connections[queue]
+    while in_flight[queue].in_flight:
+        connection.process_data_events(time_limit=0.1)
+    connection.process_data_events(time_limit=0)
+    ack_batchers[queue].flush()
+    connection.close()
+    print(f"Consumer for queue '{queue}' drained and closed.")
+
+
+def stop_consumers(signum=None, frame=None):
+    """
+    Signal handler asking every threaded consumer to stop consuming.
+
+    Notes:
+        - `stop_consuming` must run on the connection's own thread, so it is scheduled there.
+        - Consumers still connecting see `stopping` in `register_consumer` and do not start.
+    """
+
+    print("Stopping consumers...")
+    with _connections_lock:
+        stopping.set()
+        for connection, channel in connections.values():
+            connection.add_callback_threadsafe(channel.stop_consuming)
+
+
+def asyncio_consumer():
+    """
+    Runs both queues on a single asyncio event loop.
+
+    Actions:
+        - Consumes `start_learning_Queue` and `question_Queue` over one `AsyncioConnection`.
+        - Keeps up to `PREFETCH_WINDOWS[queue]` deliveries in flight per queue.
+    """
+
+    consumer = AsyncConsumer(RABBITMQ_HOST, {
+        START_LEARNING_QUEUE: (handle_start_learning_message, in_flight[START_LEARNING_QUEUE]),
+        QUESTION_QUEUE: (handle_question_message, in_flight[QUESTION_QUEUE]),
+    }, executor=executor, open_ack_batcher=open_ack_batcher)
+    consumer.run()
 
 
 def main():
@@ -181,11 +486,30 @@ def main():
     Main function to start RabbitMQ consumers for both queues.
 
     Actions:
-        - Launches the `start_learning_consumer` and `question_consumer` in separate threads.
+        - Opens the data source selected by `DATA_ACCESS_MODE`, and creates and warms up the extraction
+          process pool.
+        - In `asyncio` mode, runs both consumers on one event loop.
+        - Otherwise launches the `start_learning_consumer` and `question_consumer` in separate threads.
         - Ensures the main thread stays alive while consumers are running.
-        - Handles graceful shutdown on keyboard interruption.
+        - Handles graceful shutdown on keyboard interruption and SIGTERM.
     """
 
+    global data_source, extraction_executor
+    data_source = open_data_source()
+    extraction_executor = ExtractionExecutor()
+    extraction_executor.warm_up()
+
+    if CONSUMER_MODE == "asyncio":
+        try:
+            asyncio_consumer()
+        finally:
+            data_source.close()
+            extraction_executor.shutdown()
+        return
+
+    signal.signal(signal.SIGTERM, stop_consumers)
+    signal.signal(signal.SIGINT, stop_consumers)
+
     # Run both consumers in separate threads
     learning_thread = Thread(target=start_learning_consumer)
     question_thread = Thread(target=question_consumer)
@@ -196,6 +520,8 @@ def main():
     # Keep the main thread alive
     learning_thread.join()
     question_thread.join()
+    data_source.close()
+    extraction_executor.shutdown()
 
 if __name__ == '__main__':
     try:
@@ -0,0 +1,288 @@
+"""
+Repository Module
+
+This module holds the database queries of the QTip application so that both the FastAPI routers
+and the RabbitMQ receiver can run them directly, without going through the HTTP API.
+
+Features:
+- `get_presentation_files`: file paths attached to a presentation.
+- `get_question`: a question by its unique identifier.
+- `get_questions`: several questions in one query.
+- `update_question_ai_response`: stores the AI-assigned topic and relevance of a question.
+- `update_question_ai_responses`: stores the AI responses of many questions in one transaction.
+- `create_ai_generated_topic`: inserts a new AI-generated topic into the knowledge base.
+- `create_ai_generated_topics`: inserts many AI-generated topics with multi-row INSERTs in one transaction.
+- `normalize_uuid`: the stored form of a UUID.
+
+Notes:
+    - All functions are coroutines running on the shared `database` connection pool, which must be
+      connected in the calling event loop.
+    - UUID columns hold the canonical 32-character lowercase hex form (Django's `UUIDField` on MySQL).
+      Identifiers are normalized in Python before they are bound, so every WHERE clause compares a
+      column with a plain parameter and is resolved by an index seek (see `migrations/`).
+    - Queries are SQLAlchemy Core statements over `tables.py`, compiled once at import as
+      `PreparedQuery` objects; a call only binds its values.
+"""
+
+import uuid
+
+from sqlalchemy import bindparam, case, select, update
+
+from Qtip_fapi.database import PreparedQuery, database
+from Qtip_fapi.tables import ai_generated_topic, presentation_knowledgebase, presentation_original_questions
+
+_SELECT_PRESENTATION_FILES = PreparedQuery(
+    select(presentation_knowledgebase.c.filepath)
+    .where(presentation_knowledgebase.c.presentation_id == bindparam("presentation_id"))
+)
+
+_SELECT_QUESTION = PreparedQuery(
+    select(presentation_original_questions.c.question)
+    .where(presentation_original_questions.c.uuid == bindparam("question_id"))
+)
+
+_SELECT_QUESTIONS = PreparedQuery(
+    select(presentation_original_questions.c.uuid, presentation_original_questions.c.question)
+    .where(presentation_original_questions.c.uuid.in_(bindparam("question_ids", expanding=True)))
+)
+
+_UPDATE_QUESTION_AI_RESPONSE = PreparedQuery(
+    update(presentation_original_questions)
+    .where(presentation_original_questions.c.uuid == bindparam("question_id"))
+    .values(topic=bindparam("topic"), is_relevant=bindparam("is_relevant"))
+)
+
+_INSERT_AI_GENERATED_TOPIC = PreparedQuery(ai_generated_topic.insert())
+
+_AI_RESPONSES_PER_UPDATE = 512
+_UPDATE_QUESTION_AI_RESPONSES = {}
+
+
+def _update_question_ai_responses_query(count):
+    """
+    Returns the set-based UPDATE of `count` questions, compiled on first use.
+
+    The statement is `UPDATE ... SET topic = CASE uuid WHEN :question_id_1 THEN :topic_1 ... END,
+    is_relevant = CASE uuid WHEN ... END WHERE uuid IN (:question_id_1, ...)`; `count` is a power of
+    two, so at most a handful of statements are ever compiled.
+    """
+
+    query = _UPDATE_QUESTION_AI_RESPONSES.get(count)
+    if query is None:
+        questions = presentation_original_questions
+        question_ids = [bindparam(f"question_id_{index}") for index in range(count)]
+        query = PreparedQuery(
+            update(questions)
+            .where(questions.c.uuid.in_(question_ids))
+            .values(
+                topic=case(
+                    *[(question_id, bindparam(f"topic_{index}")) for index, question_id in enumerate(question_ids)],
+                    value=questions.c.uuid,
+                ),
+                is_relevant=case(
+                    *[(question_id, bindparam(f"is_relevant_{index}")) for index, question_id in enumerate(question_ids)],
+                    value=questions.c.uuid,
+                ),
+            )
+        )
+        _UPDATE_QUESTION_AI_RESPONSES[count] = query
+    return query
+
+
+def normalize_uuid(value):
+    """
+    Converts a UUID, in any of its usual spellings, to the form stored in the database.
+
+    Args:
+        value (str or uuid.UUID): The UUID, with or without dashes, braces or `urn:uuid:` prefix.
+
+    Returns:
+        str: The 32-character lowercase hex form.
+
+    Raises:
+        ValueError: If `value` is not a UUID.
+    """
+
+    if isinstance(value, uuid.UUID):
+        return value.hex
+    return uuid.UUID(str(value)).hex
+
+
+async def get_presentation_files(presentation_id):
+    """
+    Fetches the file paths associated with a presentation.
+
+    Args:
+        presentation_id (str): The UUID of the presentation.
+
+    Returns:
+        list: One dictionary with a `filepath` key per file; empty if none were found.
+
+    Raises:
+        ValueError: If `presentation_id` is not a UUID.
+    """
+
+    return await _SELECT_PRESENTATION_FILES.fetch_all({"presentation_id": normalize_uuid(presentation_id)})
+
+
+async def get_question(question_id):
+    """
+    Fetches a question by its unique identifier.
+
+    Args:
+        question_id (str): The UUID of the question.
+
+    Returns:
+        dict: The question, or None if no question has this UUID.
+
+    Raises:
+        ValueError: If `question_id` is not a UUID.
+    """
+
+    return await _SELECT_QUESTION.fetch_one({"question_id": normalize_uuid(question_id)})
+
+
+async def get_questions(question_ids):
+    """
+    Fetches several questions with a single `WHERE uuid IN (...)` query.
+
+    Args:
+        question_ids (list): The UUIDs of the questions, in any spelling accepted by `normalize_uuid`.
+
+    Returns:
+        dict: Each found question, as returned by `get_question`, keyed by the identifier it was
+            requested with. Identifiers that are not UUIDs or match no question are left out.
+    """
+
+    requested = {}
+    for question_id in question_ids:
+        try:
+            requested.setdefault(normalize_uuid(question_id), []).append(question_id)
+        except ValueError:  # not a UUID, so it cannot match any question
+            continue
+    if not requested:
+        return {}
+
+    rows = await _SELECT_QUESTIONS.fetch_all({"question_ids": list(requested)})
+    questions = {}
+    for row in rows:
+        for question_id in requested.get(row.pop("uuid"), ()):
+            questions[question_id] = row
+    return questions
+
+
+async def update_question_ai_response(question_id, topic, is_relevant):
+    """
+    Updates the `topic` and `is_relevant` fields of a question.
+
+    Args:
+        question_id (str): The UUID of the question to update.
+        topic (str): The AI-assigned topic.
+        is_relevant (bool): Whether the question is deemed relevant by the AI.
+
+    Raises:
+        ValueError: If `question_id` is not a UUID.
+    """
+
+    values = {
+        "topic": topic,
+        "is_relevant": 1 if is_relevant else 0,
+        "question_id": normalize_uuid(question_id),
+    }
+    await _UPDATE_QUESTION_AI_RESPONSE.execute(values)
+
+
+async def update_question_ai_responses(responses):
+    """
+    Updates the `topic` and `is_relevant` fields of many questions in one transaction.
+
+    Args:
+        responses (list): `(question_id, topic, is_relevant)` tuples; for a question listed more
+            than once, the last response wins.
+
+    Raises:
+        ValueError: If a `question_id` is not a UUID; nothing is written then.
+
+    Notes:
+        - Each chunk of up to 512 questions is written by a single set-based UPDATE, so the round
+          trips grow with the number of chunks, not of questions. A chunk is padded to the next
+          power of two by repeating its last response, which rewrites that row with the same values.
+    """
+
+    latest = {}
+    for question_id, topic, is_relevant in responses:
+        latest[normalize_uuid(question_id)] = (topic, 1 if is_relevant else 0)
+    if not latest:
+        return
+
+    items = list(latest.items())
+    async with database.transaction():
+        for start in range(0, len(items), _AI_RESPONSES_PER_UPDATE):
+            chunk = items[start:start + _AI_RESPONSES_PER_UPDATE]
+            count = 1 << (len(chunk) - 1).bit_length()
+            chunk += [chunk[-1]] * (count - len(chunk))
+            values = {}
+            for index, (question_id, (topic, is_relevant)) in enumerate(chunk):
+                values[f"question_id_{index}"] = question_id
+                values[f"topic_{index}"] = topic
+                values[f"is_relevant_{index}"] = is_relevant
+            await _update_question_ai_responses_query(count).execute(values)
+
+
+async def create_ai_generated_topic(presenter_id, presentation_id, title, summary, open_ai_request_completion_id):
+    """
+    Inserts a new AI-generated topic into the knowledge base.
+
+    Args:
+        presenter_id (str): The UUID of the presenter.
+        presentation_id (str): The UUID of the presentation.
+        title (str): The title of the topic generated by AI.
+        summary (str): A brief summary of the topic.
+        open_ai_request_completion_id (str): The unique identifier for the OpenAI request completion.
+
+    Raises:
+        ValueError: If `presenter_id` or `presentation_id` is not a UUID.
+    """
+
+    values = {
+        "uuid": uuid.uuid4().hex,
+        "presenter_id": normalize_uuid(presenter_id),
+        "presentation_id": normalize_uuid(presentation_id),
+        "title": title,
+        "summary": summary,
+        "open_ai_request_completion_id": open_ai_request_completion_id,
+    }
+    await _INSERT_AI_GENERATED_TOPIC.execute(values)
+
+
+async def create_ai_generated_topics(topics):
+    """
+    Inserts many AI-generated topics into the knowledge base in one transaction.
+
+    Args:
+        topics (list): `(presenter_id, presentation_id, title, summary, open_ai_request_completion_id)`
+            tuples, with the arguments of `create_ai_generated_topic`.
+
+    Raises:
+        ValueError: If a `presenter_id` or `presentation_id` is not a UUID; nothing is written then.
+
+    Notes:
+        - The rows are sent as multi-row `INSERT ... VALUES` statements, so the round trips do not
+          grow with the number of topics.
+    """
+
+    values = [
+        {
+            "uuid": uuid.uuid4().hex,
+            "presenter_id": normalize_uuid(presenter_id),
+            "presentation_id": normalize_uuid(presentation_id),
+            "title": title,
+            "summary": summary,
+            "open_ai_request_completion_id": open_ai_request_completion_id,
+        }
+        for presenter_id, presentation_id, title, summary, open_ai_request_completion_id in topics
+    ]
+    if not values:
+        return
+    async with database.transaction():
+        await _INSERT_AI_GENERATED_TOPIC.execute_many(values)
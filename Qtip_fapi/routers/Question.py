@@ -3,25 +3,78 @@ This module defines API endpoints for managing questions in the QTip application
 
 Includes:
 1. Retrieval of a question by its unique identifier (UUID).
-2. Updating a question's AI-assigned topic and relevance in the database.
+2. Retrieval of several questions in one database query.
+3. Updating a question's AI-assigned topic and relevance in the database.
+4. Updating the AI responses of many questions in one transaction.
 
 Schemas:
+- `QuestionBatch`: Defines the structure for fetching several questions at once.
 - `AiResponse`: Defines the structure for updating a question with its AI-assigned topic and relevance.
+- `AiResponseBatch`: Defines the structure for updating many questions at once.
 
 Endpoints:
+- `POST /question/batch`: Fetches up to `QUESTION_BATCH_MAX` questions by their unique identifiers.
 - `GET /question/{question_id}`: Fetches a question by its unique identifier.
+- `PUT /question/ai-response/batch`: Updates the `topic` and `is_relevant` fields of up to
+  `AI_RESPONSE_BATCH_MAX` questions.
 - `PUT /question/ai-response/{question_id}`: Updates the `topic` and `is_relevant` fields of a question.
+
+Attributes:
+    QUESTION_BATCH_MAX (int): Maximum number of question IDs accepted by `POST /question/batch`.
+    AI_RESPONSE_BATCH_MAX (int): Maximum number of responses accepted by `PUT /question/ai-response/batch`.
 """
 
-from fastapi import APIRouter, HTTPException
-from Qtip_fapi.database import database
-from pydantic import BaseModel
+import os
+from typing import List
 
+from fastapi import APIRouter, HTTPException
+from Qtip_fapi import repository
+from pydantic import BaseModel, Field
 
+QUESTION_BATCH_MAX = int(os.environ.get("QUESTION_BATCH_MAX", 100))
+AI_RESPONSE_BATCH_MAX = int(os.environ.get("AI_RESPONSE_BATCH_MAX", 1000))
 
 router = APIRouter()
 
 
+class QuestionBatch(BaseModel):
+    """
+        Schema for fetching several questions at once.
+
+        Attributes:
+            question_ids (list[str]): The UUIDs of the questions, at most `QUESTION_BATCH_MAX`.
+        """
+
+    question_ids: List[str] = Field(min_length=1, max_length=QUESTION_BATCH_MAX)
+
+
+@router.post("/question/batch")
+async def get_questions_by_ids(payload: QuestionBatch):
+    """
+    Fetch several questions from the database with a single query.
+
+    Args:
+        payload (QuestionBatch): The UUIDs of the questions.
+
+    Returns:
+        dict: `questions`, each found question keyed by the UUID it was requested with, and
+            `missing`, the requested UUIDs for which no question exists.
+
+    Raises:
+        HTTPException:
+            - 422: If the list is empty or longer than `QUESTION_BATCH_MAX`.
+            - 500: If an internal server error occurs.
+    """
+
+    try:
+        questions = await repository.get_questions(payload.question_ids)
+        missing = [question_id for question_id in dict.fromkeys(payload.question_ids) if question_id not in questions]
+        return {"questions": questions, "missing": missing}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+
+
 @router.get("/question/{question_id}")
 async def get_question_by_id(question_id: str):
     """
@@ -40,20 +93,17 @@ async def get_question_by_id(question_id: str):
     """
 
     try:
-        query = """
-        SELECT 
-             question
-        FROM 
-            QTip_Api_presentationoriginalquestions 
-        WHERE 
-            uuid = REPLACE(:uuid, '-', '')
-        """
-        row = await database.fetch_one(query, {"uuid": question_id})
+        try:
+            row = await repository.get_question(question_id)
+        except ValueError:  # not a UUID, so it cannot match any question
+            row = None
 
         if not row:
             raise HTTPException(status_code=404, detail="No Question found for the given Question ID.")
         return row
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
@@ -70,6 +120,60 @@ class AiResponse(BaseModel):
     topic: str
     is_relevant: bool
 
+
+class QuestionAiResponse(AiResponse):
+    """
+        Schema for one question of an `AiResponseBatch`.
+
+        Attributes:
+            question_id (str): The UUID of the question to update.
+        """
+
+    question_id: str
+
+
+class AiResponseBatch(BaseModel):
+    """
+        Schema for updating many questions with their AI-assigned topic and relevance.
+
+        Attributes:
+            responses (list[QuestionAiResponse]): The responses, at most `AI_RESPONSE_BATCH_MAX`.
+        """
+
+    responses: List[QuestionAiResponse] = Field(min_length=1, max_length=AI_RESPONSE_BATCH_MAX)
+
+
+@router.put("/question/ai-response/batch")
+async def ai_response_batch(payload: AiResponseBatch):
+    """
+        Update the `topic` and `is_relevant` fields of many questions in one transaction.
+
+        Args:
+            payload (AiResponseBatch): The AI responses, each with the UUID of its question.
+
+        Returns:
+            dict: A success message with the number of responses written.
+
+        Raises:
+            HTTPException:
+                - 422: If a `question_id` is not a UUID; no question is updated then.
+                - 500: If an internal server error occurs during the update; no question is updated then.
+        """
+
+    try:
+        await repository.update_question_ai_responses(
+            [(response.question_id, response.topic, response.is_relevant) for response in payload.responses]
+        )
+
+        return {"message": "AI Responses successfully updated in the database", "count": len(payload.responses)}
+
+    except ValueError:
+        raise HTTPException(status_code=422, detail="A question ID is not a valid UUID.")
+    except Exception as e:
+        print(f"Error occurred: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update data in the database.")
+
+
 @router.put("/question/ai-response/{question_id}")
 async def ai_response(payload: AiResponse, question_id: str):
     """
@@ -84,25 +188,17 @@ async def ai_response(payload: AiResponse, question_id: str):
 
         Raises:
             HTTPException:
+                - 422: If `question_id` is not a UUID.
                 - 500: If an internal server error occurs during the update.
         """
 
     try:
-        query = """
-            UPDATE QTip_Api_presentationoriginalquestions
-            SET topic = :topic, is_relevant = :is_relevant
-            WHERE uuid = REPLACE(:question_id, '-', '')
-        """
-        values = {
-            "topic": payload.topic,
-            "is_relevant": 1 if payload.is_relevant else 0,
-            "question_id": question_id,
-        }
-
-        await database.execute(query=query, values=values)
+        await repository.update_question_ai_response(question_id, payload.topic, payload.is_relevant)
 
         return {"message": "AI Response successfully updated in the database"}
 
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Question ID is not a valid UUID.")
     except Exception as e:
         print(f"Error occurred: {e}")
         raise HTTPException(status_code=500, detail="Failed to update data in the database.")
\ No newline at end of file
@@ -4,18 +4,29 @@ This module defines API endpoints for managing knowledge base data in the QTip a
 Includes:
 1. Retrieval of file paths associated with a specific presentation ID.
 2. Creation of new AI-generated topics with details like presenter ID, presentation ID, title, summary, and OpenAI request completion ID.
+3. Creation of many AI-generated topics in one transaction.
 
 Schemas:
 - `AiGeneratedTopicCreate`: Defines the structure for creating a new AI-generated topic.
+- `AiGeneratedTopicBatch`: Defines the structure for creating many AI-generated topics at once.
 
 Endpoints:
 - `GET /knowledgebase/{presentation_id}`: Retrieves file paths for a given presentation ID.
 - `POST /knowledgebase/ai-response`: Adds a new AI-generated topic to the knowledge base.
+- `POST /knowledgebase/ai-response/batch`: Adds up to `AI_RESPONSE_BATCH_MAX` AI-generated topics.
+
+Attributes:
+    AI_RESPONSE_BATCH_MAX (int): Maximum number of topics accepted by `POST /knowledgebase/ai-response/batch`.
 """
 
+import os
+from typing import List
+
 from fastapi import APIRouter, HTTPException
-from Qtip_fapi.database import database
-from pydantic import BaseModel, UUID4
+from Qtip_fapi import repository
+from pydantic import BaseModel, Field, UUID4
+
+AI_RESPONSE_BATCH_MAX = int(os.environ.get("AI_RESPONSE_BATCH_MAX", 1000))
 
 router = APIRouter()
 
@@ -27,21 +38,19 @@ async def get_files_by_presentation(presentation_id: str):
     with a given presentation ID from the knowledge base.
     """
     try:
-        query = """
-        SELECT filepath
-        FROM QTip_Api_presentationknowledgebase
-        WHERE presentation_id = REPLACE(:presentation_id, '-', '')
-        """
-        rows = await database.fetch_all(query,
-                                        {"presentation_id": presentation_id})
-        if not rows:
+        try:
+            files = await repository.get_presentation_files(presentation_id)
+        except ValueError:  # not a UUID, so it cannot match any presentation
+            files = None
+        if not files:
             raise HTTPException(status_code=404,
                                 detail="No files found for the given presentation ID."
                                 )
 
-        files = [dict(row) for row in rows]
         return {"files": files}
 
+    except HTTPException:
+        raise
     except Exception:
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
@@ -78,29 +87,52 @@ async def ai_response(topic: AiGeneratedTopicCreate):
     and OpenAI request completion ID
     """
     try:
-        query = """
-                    INSERT INTO QTip_Api_aigeneratedtopic
-                    (uuid, presenter_id, presentation_id, title, summary, open_ai_request_completion_id)
-                    VALUES (
-                        REPLACE(UUID(), '-', ''),
-                        REPLACE(:presenter_id, '-', ''),
-                        REPLACE(:presentation_id, '-', ''),
-                        :title,
-                        :summary,
-                        :open_ai_request_completion_id
-                    )
-                """
-        values = {
-            "presenter_id": str(topic.presenter_id),
-            "presentation_id": str(topic.presentation_id),
-            "title": topic.title,
-            "summary": topic.summary,
-            "open_ai_request_completion_id": topic.open_ai_request_completion_id,
-        }
-        await database.execute(query=query, values=values)
+        await repository.create_ai_generated_topic(
+            topic.presenter_id,
+            topic.presentation_id,
+            topic.title,
+            topic.summary,
+            topic.open_ai_request_completion_id,
+        )
 
         return {"message": "AI-generated topic successfully created."}
 
     except Exception as e:
         print(f"Error occurred: {e}")
         raise HTTPException(status_code=500, detail="Failed to create AI-generated topic.")
+
+
+class AiGeneratedTopicBatch(BaseModel):
+    """Schema for creating many AI-generated topics at once.
+
+        Attributes:
+
+            topics (list[AiGeneratedTopicCreate]): The topics, at most `AI_RESPONSE_BATCH_MAX`.
+        """
+
+    topics: List[AiGeneratedTopicCreate] = Field(min_length=1, max_length=AI_RESPONSE_BATCH_MAX)
+
+
+@router.post("/knowledgebase/ai-response/batch")
+async def ai_response_batch(payload: AiGeneratedTopicBatch):
+    """API endpoint to create many AI-generated topics in the knowledge base,
+
+    in one transaction: either every topic is created or none is.
+    """
+    try:
+        await repository.create_ai_generated_topics([
+            (
+                topic.presenter_id,
+                topic.presentation_id,
+                topic.title,
+                topic.summary,
+                topic.open_ai_request_completion_id,
+            )
+            for topic in payload.topics
+        ])
+
+        return {"message": "AI-generated topics successfully created.", "count": len(payload.topics)}
+
+    except Exception as e:
+        print(f"Error occurred: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create AI-generated topics.")
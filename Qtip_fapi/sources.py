@@ -0,0 +1,139 @@
+"""
+Extraction Sources Module
+
+This module lets the extractors read a document either from a path or from bytes already in memory,
+so a file can be read from disk once and the same buffer shared by hashing, format sniffing and parsing.
+
+Features:
+- `map_file`: maps a file read-only with `mmap`; pages are read by the kernel on first access and
+  shared between every consumer of the buffer, without copies.
+- `BufferReader`: seekable binary file object over any buffer (`bytes`, `memoryview`, `mmap`), for
+  parsers that expect a file (`PyPDF2`, `zipfile`, `python-pptx`, `python-docx`). Parsers that take a
+  buffer (`Qtip_fapi.ole2`) are given the buffer itself.
+- `open_source`: opens a path or wraps a buffer, whichever the caller has.
+
+Usage:
+    with map_file("deck.pdf") as data:
+        text = extract_text(data)
+"""
+
+import io
+import mmap
+import os
+from contextlib import contextmanager
+
+
+def is_path(source):
+    """Tells whether an extraction source is a file path rather than an in-memory buffer."""
+
+    return isinstance(source, (str, os.PathLike))
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Read-only, seekable binary file over a buffer, reading slices of it without copying the whole buffer.
+
+    Args:
+        buffer (bytes-like): `bytes`, `bytearray`, `memoryview` or `mmap`.
+
+    Notes:
+        - `read` returns `bytes`, as file consumers expect (`zipfile` searches and compares what it
+          reads), so it copies the slice requested; `readinto` copies straight into the caller's
+          buffer. Parsers that accept a buffer should be given the buffer rather than a reader.
+    """
+
+    def __init__(self, buffer):
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self._position = position
+        return position
+
+    def read(self, size=-1):
+        start = min(self._position, len(self._view))
+        end = len(self._view) if size is None or size < 0 else min(start + size, len(self._view))
+        self._position = end
+        return self._view[start:end].tobytes()
+
+    def readall(self):
+        return self.read()
+
+    def readinto(self, target):
+        target = memoryview(target).cast("B")
+        start = min(self._position, len(self._view))
+        end = min(start + len(target), len(self._view))
+        target[:end - start] = self._view[start:end]
+        self._position = end
+        return end - start
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def open_source(source):
+    """
+    Opens an extraction source as a binary file object.
+
+    Args:
+        source (str or bytes-like): A file path, or the file content.
+
+    Returns:
+        file: The opened file, or a `BufferReader` over the content; close it when done.
+    """
+
+    if is_path(source):
+        return open(source, 'rb')
+    return BufferReader(source)
+
+
+@contextmanager
+def map_file(file_path):
+    """
+    Maps a file read-only for the duration of a `with` block.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Yields:
+        mmap.mmap: The file content (`b""` for an empty file, which cannot be mapped).
+
+    Notes:
+        - If a parser still holds a view of the mapping when the block exits, the mapping is left
+          for the garbage collector to close rather than failing the extraction.
+    """
+
+    with open(file_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b""
+            return
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield mapping
+    finally:
+        try:
+            mapping.close()
+        except BufferError:
+            pass
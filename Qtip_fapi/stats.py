@@ -0,0 +1,29 @@
+"""
+Statistics Module
+
+Small statistics helpers shared by the runtime metrics (`database.PoolMetrics`) and the benchmarks,
+so every reported percentile is computed the same way.
+"""
+
+import math
+
+
+def percentile(values, fraction):
+    """
+    Returns the nearest-rank percentile of `values`.
+
+    Args:
+        values (iterable): The samples; need not be sorted.
+        fraction (float): The percentile as a fraction, e.g. `0.99` for p99.
+
+    Returns:
+        The smallest sample with at least `fraction` of the samples at or below it, or None if
+        there are no samples.
+    """
+
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = math.ceil(round(fraction * len(ordered), 9))  # 0.07 * 100 is 7.000000000000001
+    index = min(len(ordered) - 1, max(0, rank - 1))
+    return ordered[index]
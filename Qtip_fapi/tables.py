@@ -0,0 +1,48 @@
+"""
+Table Definitions Module
+
+This module describes, on the shared SQLAlchemy `metadata`, the tables of the QTip schema that the
+API reads and writes. The tables are created and migrated by the QTip Django application; these
+definitions only let the queries in `repository.py` be built as SQLAlchemy Core statements.
+
+Tables:
+- `presentation_knowledgebase`: files uploaded for a presentation (`QTip_Api_presentationknowledgebase`).
+- `presentation_original_questions`: questions asked during a presentation
+  (`QTip_Api_presentationoriginalquestions`).
+- `ai_generated_topic`: topics generated by AI for a presentation (`QTip_Api_aigeneratedtopic`).
+
+Notes:
+    - Only the columns used by the API are declared.
+    - UUID columns are `char(32)` holding the lowercase hex form (see `repository.normalize_uuid`).
+"""
+
+from sqlalchemy import CHAR, Boolean, Column, String, Table, Text
+
+from Qtip_fapi.database import metadata
+
+presentation_knowledgebase = Table(
+    "QTip_Api_presentationknowledgebase",
+    metadata,
+    Column("presentation_id", CHAR(32), index=True),
+    Column("filepath", String(255)),
+)
+
+presentation_original_questions = Table(
+    "QTip_Api_presentationoriginalquestions",
+    metadata,
+    Column("uuid", CHAR(32), index=True),
+    Column("question", Text),
+    Column("topic", String(255)),
+    Column("is_relevant", Boolean),
+)
+
+ai_generated_topic = Table(
+    "QTip_Api_aigeneratedtopic",
+    metadata,
+    Column("uuid", CHAR(32), primary_key=True),
+    Column("presenter_id", CHAR(32)),
+    Column("presentation_id", CHAR(32), index=True),
+    Column("title", String(255)),
+    Column("summary", Text),
+    Column("open_ai_request_completion_id", String(255)),
+)
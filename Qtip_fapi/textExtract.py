@@ -1,171 +1,1221 @@
 """
 Text Extraction Module
 
-This module provides functions to extract text from various document formats, including PDF, PowerPoint, Word, and ODP (OpenDocument Presentation) files.
+This module provides functions to extract text from various document formats, including PDF, PowerPoint, Word, ODP (OpenDocument Presentation) and ODT (OpenDocument Text) files.
 
 Features:
 - Extract text from PDF files using `PyPDF2`.
-- Extract text from PowerPoint files using `python-pptx`.
-- Extract text from Word documents (DOCX) using `python-docx`.
-- Extract text from ODP files using `odf` libraries.
-- Generic function `extract_text` to handle different file types dynamically.
+- Extract text from PowerPoint files and Word documents (DOCX) by streaming their slide/document XML,
+  with `python-pptx` and `python-docx` as fallback.
+- Extract text from ODP and ODT files by streaming their `content.xml` with `lxml.etree.iterparse`.
+- Extract text from legacy PowerPoint 97 (PPT) and Word 97 (DOC) binaries by reading their text
+  records out of the OLE2 compound file (`Qtip_fapi.ole2`), without LibreOffice.
+- Format sniffing from header bytes (`sniff_mime_type`): PDF, OLE2 (legacy `.doc`/`.ppt`) and zip
+  packages (ODF, DOCX, PPTX) are recognised whatever their extension; unsupported formats, and files
+  named like a zip or OLE2 format whose content is something else, are rejected before any parse is
+  attempted.
+- Every extractor reads either a path or the file content already in memory (`bytes`, `memoryview`
+  or `mmap`, see `Qtip_fapi.sources`), so a file mapped once can be hashed, sniffed and parsed
+  without being read again or copied.
+- Generic function `extract_text` to handle different file types dynamically, through a registry
+  of `Extractor` classes keyed by extension and MIME type (`register_extractor`), which other
+  modules can extend with their own formats.
+- Parser libraries (`PyPDF2`, `python-pptx`, `python-docx`, `lxml`) are imported on first use, so
+  importing this module is cheap; `preload_extractors` imports them up front in warm workers (the
+  `python-pptx`/`python-docx` object models only as optional fallbacks while XML streaming is on).
+- Text is accumulated in lists and joined once, so extraction time grows linearly with document size.
+- Streaming generators (`iter_text`, `iter_text_from_*`) yielding one page, slide or paragraph at a
+  time as it is parsed, so downstream chunking can start early and memory stays flat on large files.
 
 Attributes:
     SUPPORTED_EXTENSIONS (list): List of supported file extensions.
+    EXTRACTORS (list): Registered `Extractor` instances, in registration order.
+    PARSER_VERSION (str): Version of the extraction output; bump it whenever a change to the extractors
+        changes the text they return, so cached extractions are invalidated.
+    FAST_XML_EXTRACTION (bool): Read DOCX and PPTX text straight from their XML parts instead of the
+        `python-docx`/`python-pptx` object models (`FAST_XML_EXTRACTION=0` disables it).
 """
 
-import PyPDF2
-from pptx import Presentation
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from pathlib import Path
-from docx import Document
-from odf.opendocument import load
-from odf.text import P
+import importlib
 import os
+import posixpath
+import re
+import struct
+import zipfile
+
+from Qtip_fapi.sources import is_path, map_file, open_source
 # from sklearn.metrics.pairwise import cosine_similarity
 # from sklearn.feature_extraction.text import TfidfVectorizer
 
-
-def extract_text_from_pdf(file_path):
+PARSER_VERSION = "5"
+FAST_XML_EXTRACTION = os.environ.get("FAST_XML_EXTRACTION", "1") != "0"
+
+_ODF_DRAW = "urn:oasis:names:tc:opendocument:xmlns:drawing:1.0"
+_ODF_TEXT = "urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+_ODF_PAGE = f"{{{_ODF_DRAW}}}page"
+_ODF_PARAGRAPHS = (f"{{{_ODF_TEXT}}}p", f"{{{_ODF_TEXT}}}h")
+_ODF_SPACE = f"{{{_ODF_TEXT}}}s"
+_ODF_SPACE_COUNT = f"{{{_ODF_TEXT}}}c"
+_ODF_TAB = f"{{{_ODF_TEXT}}}tab"
+_ODF_LINE_BREAK = f"{{{_ODF_TEXT}}}line-break"
+
+_WML = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_WML_PARAGRAPH = f"{{{_WML}}}p"
+_WML_TEXT = f"{{{_WML}}}t"
+_WML_TAB = f"{{{_WML}}}tab"
+_WML_BREAKS = (f"{{{_WML}}}br", f"{{{_WML}}}cr")
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_WML_SKIPPED = (f"{{{_WML}}}pPr", f"{{{_WML}}}rPr", _WML_PARAGRAPH, f"{{{_WML}}}txbxContent", _MC_FALLBACK)
+_DML = "http://schemas.openxmlformats.org/drawingml/2006/main"
+_DML_RUN = f"{{{_DML}}}r"
+_DML_TEXT = f"{{{_DML}}}t"
+_PML_SLIDE_ID = "{http://schemas.openxmlformats.org/presentationml/2006/main}sldId"
+_REL_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+
+MIME_PDF = "application/pdf"
+MIME_DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+MIME_PPTX = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+MIME_ODP = "application/vnd.oasis.opendocument.presentation"
+MIME_ODT = "application/vnd.oasis.opendocument.text"
+MIME_DOC = "application/msword"
+MIME_PPT = "application/vnd.ms-powerpoint"
+MIME_OLE2 = "application/x-ole-storage"
+MIME_ZIP = "application/zip"
+
+_PDF_SIGNATURE = b"%PDF-"
+_ZIP_SIGNATURE = b"PK\x03\x04"
+_OLE2_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+_PPT_DOCUMENT_STREAM = "PowerPoint Document"
+_PPT_CURRENT_USER_STREAM = "Current User"
+_PPT_DOCUMENT = 0x03E8
+_PPT_SLIDE = 0x03EE
+_PPT_SLIDE_LIST_WITH_TEXT = 0x0FF0
+_PPT_SLIDE_PERSIST_ATOM = 0x03F3
+_PPT_USER_EDIT_ATOM = 0x0FF5
+_PPT_PERSIST_DIRECTORY_ATOM = 0x1772
+_PPT_OUTLINE_TEXT_REF_ATOM = 0x0F9E
+_PPT_TEXT_HEADER_ATOM = 0x0F9F
+_PPT_TEXT_CHARS_ATOM = 0x0FA0
+_PPT_TEXT_BYTES_ATOM = 0x0FA8
+_PPT_TEXT_BREAKS = str.maketrans({"\r": " ", "\x0b": " "})
+
+_DOC_STREAM = "WordDocument"
+_DOC_MAGIC = 0xA5EC
+_DOC_ENCRYPTED = 0x0100
+_DOC_WHICH_TABLE_STREAM = 0x0200
+_DOC_FC_COMPRESSED = 0x40000000
+_DOC_CLX_INDEX = 33  # fcClx/lcbClx pair in FibRgFcLcb97 (FIB offsets 0x01A2/0x01A6)
+_DOC_FIELD_MARKS = re.compile("([\x13\x14\x15])")
+_DOC_PARAGRAPH_MARKS = re.compile("[\r\x07\x0c]")
+_DOC_SPECIAL_CHARACTERS = str.maketrans({
+    "\x0b": "\n", "\x1e": "-", "\x1f": None,
+    "\x01": None, "\x02": None, "\x03": None, "\x04": None, "\x05": None, "\x08": None,
+})
+
+
+def iter_text_from_pdf(source):
     """
-        Extracts text from a PDF file.
+        Yields the text of a PDF file one page at a time.
 
         Args:
-            file_path (str): The path to the PDF file.
+            source (str or bytes-like): The path to the PDF file, or its content.
 
-        Returns:
-            str: The extracted text from the PDF file.
+        Yields:
+            str: The text of each page, in page order.
 
         Notes:
-            - Uses `PyPDF2` to read PDF files.
-            - Handles errors gracefully and prints error messages.
+            - Uses `PyPDF2` to read PDF files; a page is only parsed when the next item is requested.
+            - Handles errors gracefully and prints error messages; pages yielded before the error are kept.
         """
 
-    text = ""
+    import PyPDF2
+
     try:
-        with open(file_path, 'rb') as file:
+        with open_source(source) as file:
             reader = PyPDF2.PdfReader(file)
             for page in reader.pages:
-                text += page.extract_text()
+                yield page.extract_text()
     except Exception as e:
         print(f"Error reading PDF: {e}")
-    return text
 
 
-def extract_text_from_pptx(file_path):
+def extract_text_from_pdf(source):
     """
-        Extracts text from a PowerPoint (PPTX) file.
+        Extracts text from a PDF file.
 
         Args:
-            file_path (str): The path to the PowerPoint file.
+            source (str or bytes-like): The path to the PDF file, or its content.
 
         Returns:
-            str: The extracted text from the PowerPoint file.
+            str: The extracted text from the PDF file.
+
+        Notes:
+            - Joins the pages yielded by `iter_text_from_pdf`.
+        """
+
+    return "".join(iter_text_from_pdf(source))
+
+
+@contextmanager
+def _open_package(source):
+    """Opens a zip document package (ODF, DOCX, PPTX) from a path or from its content."""
+
+    with open_source(source) as file, zipfile.ZipFile(file) as package:
+        yield package
+
+
+def _open_compound_file(source):
+    """Opens an OLE2 compound file (DOC, PPT) from a path or from its content."""
+
+    from Qtip_fapi.ole2 import CompoundFile
+
+    return CompoundFile.open(source) if is_path(source) else CompoundFile(source)
+
+
+def _iter_xml_elements(package, member, tags):
+    """
+        Streams the elements of an XML part of a zip package (ODF, DOCX, PPTX) as they are parsed.
+
+        Args:
+            package (zipfile.ZipFile): The open document package.
+            member (str): Name of the XML part, e.g. `content.xml` or `word/document.xml`.
+            tags (tuple): Qualified tag names (`{namespace}name`) to yield.
+
+        Yields:
+            lxml.etree._Element: Each matching element, once its end tag has been read.
 
         Notes:
-            - Uses `python-pptx` to extract text from slides and their shapes.
+            - Reads the part straight from the zip with `lxml.etree.iterparse`.
+            - Every element is cleared after the caller is done with it, and its already-parsed
+              previous siblings are dropped, so memory stays bounded on large documents.
+        """
+
+    from lxml import etree
+
+    with package.open(member) as content:
+        for _, element in etree.iterparse(content, events=("end",), tag=tags):
+            yield element
+            element.clear(keep_tail=True)
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+
+def _iter_with_fallback(fast, slow, source):
+    """
+        Yields from the direct-XML extractor `fast`, falling back to the object-model extractor `slow`.
+
+        Notes:
+            - Falls back when `FAST_XML_EXTRACTION` is off, or when the fast path fails or finds nothing
+              before yielding anything (missing parts, unexpected package layout, Strict OOXML, ...).
+            - An error after the fast path started yielding is raised, so no text is yielded twice.
+        """
+
+    if FAST_XML_EXTRACTION:
+        produced = False
+        try:
+            for item in fast(source):
+                produced = True
+                yield item
+        except Exception as e:
+            if produced:
+                raise
+            print(f"Fast XML extraction failed ({e}), using the object model.")
+        if produced:
+            return
+    yield from slow(source)
+
+
+def _in_fallback_content(element):
+    """Tells whether an element sits in `mc:Fallback` content, which duplicates the `mc:Choice` text."""
+
+    return any(ancestor.tag == _MC_FALLBACK for ancestor in element.iterancestors(_MC_FALLBACK))
+
+
+def _pptx_slide_members(package):
+    """
+        Returns the zip member names of a PPTX package's slides, in presentation order.
+        """
+
+    from lxml import etree
+
+    presentation = etree.fromstring(package.read("ppt/presentation.xml"))
+    relationships = etree.fromstring(package.read("ppt/_rels/presentation.xml.rels"))
+    targets = {relationship.get("Id"): relationship.get("Target") for relationship in relationships}
+    members = []
+    for slide_id in presentation.iter(_PML_SLIDE_ID):
+        target = targets[slide_id.get(_REL_ID)]
+        if target.startswith("/"):
+            members.append(target.lstrip("/"))
+        else:
+            members.append(posixpath.normpath(posixpath.join("ppt", target)))
+    return members
+
+
+def _iter_pptx_xml(source):
+    """
+        Yields the text of a PPTX file one slide at a time, streaming `ppt/slides/slideN.xml`.
+
+        Notes:
+            - Collects the `a:t` text of every `a:r` run, tables and grouped shapes included.
+        """
+
+    with _open_package(source) as package:
+        for member in _pptx_slide_members(package):
+            runs = []
+            for run in _iter_xml_elements(package, member, (_DML_RUN,)):
+                if not _in_fallback_content(run):
+                    runs.append(run.findtext(_DML_TEXT) or "")
+                    runs.append(" ")
+            yield "".join(runs)
+
+
+def _iter_pptx_object_model(source):
+    """
+        Yields the text of a PPTX file one slide at a time, through the `python-pptx` object model.
+        """
+
+    from pptx import Presentation
+
+    with open_source(source) as file:
+        presentation = Presentation(file)
+    for slide in presentation.slides:
+        runs = []
+        for shape in slide.shapes:
+            if shape.has_text_frame:
+                for paragraph in shape.text_frame.paragraphs:
+                    for run in paragraph.runs:
+                        runs.append(run.text)
+                        runs.append(" ")
+        yield "".join(runs)
+
+
+def iter_text_from_pptx(source):
+    """
+        Yields the text of a PowerPoint (PPTX) file one slide at a time.
+
+        Args:
+            source (str or bytes-like): The path to the PowerPoint file, or its content.
+
+        Yields:
+            str: The text runs of each slide, each followed by a space.
+
+        Notes:
+            - Streams the slide XML parts directly (`FAST_XML_EXTRACTION`), falling back to
+              `python-pptx` when needed.
             - Handles errors gracefully and prints error messages.
         """
 
-    text = ""
     try:
-        presentation = Presentation(file_path)
-        for slide in presentation.slides:
-            for shape in slide.shapes:
-                if shape.has_text_frame:
-                    for paragraph in shape.text_frame.paragraphs:
-                        for run in paragraph.runs:
-                            text += run.text + " "
+        yield from _iter_with_fallback(_iter_pptx_xml, _iter_pptx_object_model, source)
     except Exception as e:
         print(f"Error reading PowerPoint: {e}")
-    return text
 
 
-def extract_text_from_docx(file_path):
+def extract_text_from_pptx(source):
+    """
+        Extracts text from a PowerPoint (PPTX) file.
+
+        Args:
+            source (str or bytes-like): The path to the PowerPoint file, or its content.
+
+        Returns:
+            str: The extracted text from the PowerPoint file.
+
+        Notes:
+            - Joins the slides yielded by `iter_text_from_pptx`.
+        """
+
+    return "".join(iter_text_from_pptx(source))
+
+
+def _docx_paragraph_text(element):
+    """
+        Returns the text of a WordprocessingML paragraph (`w:p`) or of an inline element within it.
+
+        Notes:
+            - Follows `python-docx`: `w:t` text, `w:tab` as a tab, `w:br`/`w:cr` as a newline.
+            - Skips properties, nested text-box paragraphs (yielded on their own) and `mc:Fallback` copies.
+        """
+
+    parts = []
+    for child in element:
+        if child.tag == _WML_TEXT:
+            parts.append(child.text or "")
+        elif child.tag == _WML_TAB:
+            parts.append("\t")
+        elif child.tag in _WML_BREAKS:
+            parts.append("\n")
+        elif child.tag not in _WML_SKIPPED:
+            parts.append(_docx_paragraph_text(child))
+    return "".join(parts)
+
+
+def _iter_docx_xml(source):
+    """
+        Yields the paragraphs of a DOCX file, streaming `word/document.xml`.
+
+        Notes:
+            - Table cell paragraphs are included, in document order.
+        """
+
+    with _open_package(source) as package:
+        for paragraph in _iter_xml_elements(package, "word/document.xml", (_WML_PARAGRAPH,)):
+            if not _in_fallback_content(paragraph):
+                yield _docx_paragraph_text(paragraph)
+
+
+def _iter_docx_object_model(source):
+    """
+        Yields the body paragraphs of a DOCX file through the `python-docx` object model.
+        """
+
+    from docx import Document
+
+    with open_source(source) as file:
+        doc = Document(file)
+    for paragraph in doc.paragraphs:
+        yield paragraph.text
+
+
+def iter_text_from_docx(source):
+    """
+        Yields the paragraphs of a Word document (DOCX).
+
+        Args:
+            source (str or bytes-like): The path to the Word document, or its content.
+
+        Yields:
+            str: The text of each paragraph, in document order.
+
+        Notes:
+            - Streams `word/document.xml` directly (`FAST_XML_EXTRACTION`), which also picks up table
+              cells, falling back to `python-docx` when needed.
+        """
+
+    yield from _iter_with_fallback(_iter_docx_xml, _iter_docx_object_model, source)
+
+
+def extract_text_from_docx(source):
     """
         Extracts text from a Word document (DOCX).
 
         Args:
-            file_path (str): The path to the Word document.
+            source (str or bytes-like): The path to the Word document, or its content.
 
         Returns:
             str: The extracted text from the Word document, with each paragraph separated by a newline.
 
         Notes:
-            - Uses the `python-docx` library to process DOCX files.
-            - Iterates through all paragraphs in the document and joins their text content with newline characters.
+            - Joins the paragraphs yielded by `iter_text_from_docx` with newline characters.
             - Only extracts visible text content; metadata or embedded objects are not included.
         """
 
-    doc = Document(file_path)
-    return "\n".join([paragraph.text for paragraph in doc.paragraphs])
+    return "\n".join(iter_text_from_docx(source))
+
+
+def _odf_paragraph_text(element):
+    """
+        Returns the text of an OpenDocument paragraph or heading.
+
+        Notes:
+            - Includes text in spans, links and other inline elements.
+            - Expands `text:s` (spaces), `text:tab` and `text:line-break`.
+        """
+
+    parts = []
+    if element.text:
+        parts.append(element.text)
+    for child in element:
+        if child.tag == _ODF_SPACE:
+            parts.append(" " * int(child.get(_ODF_SPACE_COUNT, 1)))
+        elif child.tag == _ODF_TAB:
+            parts.append("\t")
+        elif child.tag == _ODF_LINE_BREAK:
+            parts.append("\n")
+        elif child.tag not in _ODF_PARAGRAPHS:
+            parts.append(_odf_paragraph_text(child))
+        if child.tail:
+            parts.append(child.tail)
+    return "".join(parts)
+
+
+def iter_text_from_odp(source):
+    """
+        Yields the text of an OpenDocument Presentation (ODP) file one slide at a time.
+
+        Args:
+            source (str or bytes-like): The path to the ODP file, or its content.
+
+        Yields:
+            str: The non-empty paragraphs of each slide, joined with newlines. Slides without text are skipped.
+
+        Notes:
+            - Streams `content.xml` with `lxml.etree.iterparse` instead of loading the odfpy DOM.
+            - Speaker notes are part of their slide.
+            - Handles errors gracefully and prints error messages; slides yielded before the error are kept.
+        """
+
+    try:
+        with _open_package(source) as package:
+            paragraphs = []
+            for element in _iter_xml_elements(package, "content.xml", (_ODF_PAGE,) + _ODF_PARAGRAPHS):
+                if element.tag == _ODF_PAGE:
+                    if paragraphs:
+                        yield "\n".join(paragraphs)
+                    paragraphs = []
+                    continue
+                paragraph_text = _odf_paragraph_text(element).strip()
+                if paragraph_text:  # Avoid adding empty lines
+                    paragraphs.append(paragraph_text)
+    except Exception as e:
+        print(f"Error reading ODP file: {e}")
 
 
-def extract_text_from_odp(file_path):
+def extract_text_from_odp(source):
     """
         Extracts text from an OpenDocument Presentation (ODP) file.
 
         Args:
-            file_path (str): The path to the ODP file.
+            source (str or bytes-like): The path to the ODP file, or its content.
 
         Returns:
             str: The extracted text from the ODP file.
 
         Notes:
-            - Uses `odf.opendocument` to load ODP files.
-            - Extracts text content from paragraphs and spans.
-            - Handles errors gracefully and returns an error message if extraction fails.
+            - Joins the slides yielded by `iter_text_from_odp`.
+        """
+
+    return "\n".join(iter_text_from_odp(source))
+
+
+def iter_text_from_odt(source):
+    """
+        Yields the paragraphs and headings of an OpenDocument Text (ODT) file.
+
+        Args:
+            source (str or bytes-like): The path to the ODT file, or its content.
+
+        Yields:
+            str: The text of each non-empty paragraph, in document order (table cells included).
+
+        Notes:
+            - Streams `content.xml` with `lxml.etree.iterparse`.
+            - Handles errors gracefully and prints error messages.
         """
 
     try:
-        doc = load(file_path)
-        text = []
-        
-        # Loop through all paragraphs in the document
-        for paragraph in doc.getElementsByType(P):
-            paragraph_text = ""
-            # Loop through child nodes (e.g., spans, text nodes)
-            for node in paragraph.childNodes:
-                if node.nodeType == 3:  # Text Node
-                    paragraph_text += str(node.data).strip()
-                elif node.nodeType == 1 and node.tagName == "text:span":  # Span Node
-                    paragraph_text += "".join([str(child.data) for child in node.childNodes if child.nodeType == 3])
-            if paragraph_text.strip():  # Avoid adding empty lines
-                text.append(paragraph_text)
-        
-        return "\n".join(text)
+        with _open_package(source) as package:
+            for element in _iter_xml_elements(package, "content.xml", _ODF_PARAGRAPHS):
+                paragraph_text = _odf_paragraph_text(element).strip()
+                if paragraph_text:
+                    yield paragraph_text
     except Exception as e:
-        return f"Error reading ODP file: {e}"
+        print(f"Error reading ODT file: {e}")
+
+
+def extract_text_from_odt(source):
+    """
+        Extracts text from an OpenDocument Text (ODT) file.
+
+        Args:
+            source (str or bytes-like): The path to the ODT file, or its content.
+
+        Returns:
+            str: The extracted text, one paragraph per line.
+        """
+
+    return "\n".join(iter_text_from_odt(source))
+
+
+def _ppt_records(data, start, end):
+    """
+        Yields the `(type, offset, body_start, body_end, is_container)` of the PowerPoint records
+        between two offsets.
+
+        Notes:
+            - Containers (record version 0xF) are not entered; callers recurse into their body.
+        """
+
+    while start + 8 <= end:
+        version_instance, record_type, length = struct.unpack_from("<HHI", data, start)
+        body_end = min(start + 8 + length, end)
+        yield record_type, start, start + 8, body_end, (version_instance & 0xF) == 0xF
+        start = body_end
+
+
+def _ppt_atom_text(data, record_type, body_start, body_end):
+    """Decodes a `TextCharsAtom` (UTF-16) or `TextBytesAtom` (Latin-1) body."""
+
+    encoding = "utf-16-le" if record_type == _PPT_TEXT_CHARS_ATOM else "latin-1"
+    return bytes(data[body_start:body_end]).decode(encoding, "replace")
+
+
+def _ppt_text_runs(data, start, end, outline_texts=()):
+    """
+        Yields the text of the `TextCharsAtom` (UTF-16) and `TextBytesAtom` (Latin-1) records of a container.
+
+        Args:
+            outline_texts (list of str): Text groups an `OutlineTextRefAtom` of the container points at,
+                by index (see `_ppt_slides`).
+        """
+
+    for record_type, _, body_start, body_end, container in _ppt_records(data, start, end):
+        if container:
+            yield from _ppt_text_runs(data, body_start, body_end, outline_texts)
+        elif record_type in (_PPT_TEXT_CHARS_ATOM, _PPT_TEXT_BYTES_ATOM):
+            yield _ppt_atom_text(data, record_type, body_start, body_end)
+        elif record_type == _PPT_OUTLINE_TEXT_REF_ATOM and body_end - body_start >= 4:
+            index = struct.unpack_from("<i", data, body_start)[0]
+            if 0 <= index < len(outline_texts):
+                yield outline_texts[index]
 
 
-def extract_text(file_path):
+def _ppt_persist_offsets(document, current_user):
     """
-        Extracts text from a file based on its extension.
+        Resolves the live persist objects of a PowerPoint document.
 
         Args:
-            file_path (str): The path to the file.
+            document (bytes): The `PowerPoint Document` stream.
+            current_user (bytes): The `Current User` stream.
+
+        Returns:
+            dict: Stream offset of every persist object, by persist id.
+
+        Notes:
+            - Follows the chain of `UserEditAtom` records from the current edit back to the first
+              save; the most recent persist directory entry of an id wins, so objects left behind by
+              incremental saves are ignored.
+        """
+
+    offsets = {}
+    edit_offset = struct.unpack_from("<I", current_user, 16)[0]
+    visited = set()
+    while edit_offset not in visited and edit_offset + 24 <= len(document):
+        visited.add(edit_offset)
+        if struct.unpack_from("<H", document, edit_offset + 2)[0] != _PPT_USER_EDIT_ATOM:
+            break
+        last_edit_offset, directory_offset = struct.unpack_from("<II", document, edit_offset + 16)
+        _, record_type, length = struct.unpack_from("<HHI", document, directory_offset)
+        if record_type != _PPT_PERSIST_DIRECTORY_ATOM:
+            break
+        position, end = directory_offset + 8, directory_offset + 8 + length
+        while position + 4 <= end:
+            entry = struct.unpack_from("<I", document, position)[0]
+            first_id, count = entry & 0xFFFFF, entry >> 20
+            ids = range(first_id, first_id + count)
+            for persist_id, offset in zip(ids, struct.unpack_from(f"<{count}I", document, position + 4)):
+                offsets.setdefault(persist_id, offset)
+            position += 4 + 4 * count
+        if last_edit_offset == 0:
+            break
+        edit_offset = last_edit_offset
+    return offsets
+
+
+def _ppt_slides(document, current_user):
+    """
+        Returns the slides of a PowerPoint document, in slide order.
+
+        Returns:
+            list: `(offset, outline_texts)` pairs: the stream offset of each `Slide` container, and
+                the text groups the slide list holds for it.
+
+        Notes:
+            - Slide order comes from the `SlidePersistAtom` records of the slide list (instance 0 of
+              `SlideListWithText`), resolved through the persist directory.
+            - Each `SlidePersistAtom` is followed by the slide's placeholder text: one group per
+              `TextHeaderAtom`, made of the `TextCharsAtom`/`TextBytesAtom` records after it. Slides
+              saved by PowerPoint 97-2003 only hold an `OutlineTextRefAtom` with the index of a group.
+            - Without a usable `Current User` stream, every top-level `Slide` container is returned
+              in stream order, without outline text.
+        """
+
+    try:
+        persist_offsets = _ppt_persist_offsets(document, current_user)
+    except struct.error:
+        persist_offsets = {}
+    slides = []
+    for record_type, _, body_start, body_end, container in _ppt_records(document, 0, len(document)):
+        if record_type != _PPT_DOCUMENT or not container:
+            continue
+        for list_type, list_offset, list_start, list_end, _ in _ppt_records(document, body_start, body_end):
+            instance = struct.unpack_from("<H", document, list_offset)[0] >> 4
+            if list_type != _PPT_SLIDE_LIST_WITH_TEXT or instance != 0:
+                continue
+            outline_texts = None
+            for atom_type, _, atom_start, atom_end, _ in _ppt_records(document, list_start, list_end):
+                if atom_type == _PPT_SLIDE_PERSIST_ATOM:
+                    persist_id = struct.unpack_from("<I", document, atom_start)[0]
+                    outline_texts = []
+                    if persist_id in persist_offsets:
+                        slides.append((persist_offsets[persist_id], outline_texts))
+                elif outline_texts is None:
+                    continue
+                elif atom_type == _PPT_TEXT_HEADER_ATOM:
+                    outline_texts.append("")
+                elif outline_texts and atom_type in (_PPT_TEXT_CHARS_ATOM, _PPT_TEXT_BYTES_ATOM):
+                    outline_texts[-1] += _ppt_atom_text(document, atom_type, atom_start, atom_end)
+        break
+    if slides:
+        return slides
+    return [
+        (offset, []) for record_type, offset, _, _, container in _ppt_records(document, 0, len(document))
+        if record_type == _PPT_SLIDE and container
+    ]
+
+
+def iter_text_from_ppt(source):
+    """
+        Yields the text of a legacy PowerPoint 97-2003 (PPT) file one slide at a time.
+
+        Args:
+            source (str or bytes-like): The path to the PPT file, or its content.
+
+        Yields:
+            str: The text runs of each slide, each followed by a space, like `iter_text_from_pptx`.
+
+        Notes:
+            - Reads the `PowerPoint Document` stream of the OLE2 compound file and collects the text
+              atoms of every live slide; master slides and notes are skipped.
+            - Placeholder text kept in the slide list (`OutlineTextRefAtom`) is read where the slide
+              refers to it, so title and body text of PowerPoint 97-2003 decks is not lost.
+            - Handles errors gracefully and prints error messages.
+        """
+
+    try:
+        with _open_compound_file(source) as compound_file:
+            document = compound_file.read_stream(_PPT_DOCUMENT_STREAM)
+            current_user = b""
+            if compound_file.has_stream(_PPT_CURRENT_USER_STREAM):
+                current_user = compound_file.read_stream(_PPT_CURRENT_USER_STREAM)
+        for offset, outline_texts in _ppt_slides(document, current_user):
+            length = struct.unpack_from("<I", document, offset + 4)[0]
+            runs = []
+            end = min(offset + 8 + length, len(document))
+            for text in _ppt_text_runs(document, offset + 8, end, outline_texts):
+                runs.append(text.translate(_PPT_TEXT_BREAKS))
+                runs.append(" ")
+            yield "".join(runs)
+    except Exception as e:
+        print(f"Error reading PowerPoint 97 file: {e}")
+
+
+def extract_text_from_ppt(source):
+    """
+        Extracts text from a legacy PowerPoint 97-2003 (PPT) file.
+
+        Args:
+            source (str or bytes-like): The path to the PPT file, or its content.
+
+        Returns:
+            str: The extracted text, slides joined like `extract_text_from_pptx`.
+        """
+
+    return "".join(iter_text_from_ppt(source))
+
+
+def _doc_visible_text(text):
+    """
+        Drops the field instructions of Word text, keeping the field results.
+
+        Notes:
+            - Fields are `0x13 instructions 0x14 result 0x15` and may nest.
+        """
+
+    parts = []
+    fields = []  # per open field: True once past its separator
+    for token in _DOC_FIELD_MARKS.split(text):
+        if token == "\x13":
+            fields.append(False)
+        elif token == "\x14":
+            if fields:
+                fields[-1] = True
+        elif token == "\x15":
+            if fields:
+                fields.pop()
+        elif all(fields):
+            parts.append(token)
+    return "".join(parts)
+
+
+def _doc_main_text(word_document, table):
+    """
+        Reads the main document text of a Word 97 file through its piece table.
+
+        Args:
+            word_document (bytes): The `WordDocument` stream.
+            table (bytes): The `0Table` or `1Table` stream named by the FIB.
+
+        Returns:
+            str: The raw text, control characters included.
+        """
+
+    csw = struct.unpack_from("<H", word_document, 0x20)[0]
+    rg_lw = 0x22 + csw * 2 + 2
+    cslw = struct.unpack_from("<H", word_document, rg_lw - 2)[0]
+    ccp_text = struct.unpack_from("<i", word_document, rg_lw + 12)[0]
+    rg_fc_lcb = rg_lw + cslw * 4 + 2
+    fc_clx, lcb_clx = struct.unpack_from("<II", word_document, rg_fc_lcb + _DOC_CLX_INDEX * 8)
+    clx = table[fc_clx:fc_clx + lcb_clx]
+
+    position = 0
+    while position < len(clx) and clx[position] == 0x01:  # Prc: skip its property modifiers
+        position += 3 + struct.unpack_from("<h", clx, position + 1)[0]
+    if position >= len(clx) or clx[position] != 0x02:
+        raise ValueError("Missing piece table")
+    plc_length = struct.unpack_from("<I", clx, position + 1)[0]
+    plc = clx[position + 5:position + 5 + plc_length]
+    pieces = (len(plc) - 4) // 12
+    cps = struct.unpack_from(f"<{pieces + 1}i", plc)
+
+    parts = []
+    for index in range(pieces):
+        cp_start, cp_end = cps[index], min(cps[index + 1], ccp_text)
+        if cp_start >= cp_end:
+            break
+        fc = struct.unpack_from("<I", plc, 4 * (pieces + 1) + 8 * index + 2)[0]
+        count = cp_end - cp_start
+        if fc & _DOC_FC_COMPRESSED:
+            start = (fc & ~_DOC_FC_COMPRESSED) // 2
+            parts.append(bytes(word_document[start:start + count]).decode("cp1252", "replace"))
+        else:
+            parts.append(bytes(word_document[fc:fc + 2 * count]).decode("utf-16-le", "replace"))
+    return "".join(parts)
+
+
+def iter_text_from_doc(source):
+    """
+        Yields the paragraphs of a legacy Word 97-2003 (DOC) file.
+
+        Args:
+            source (str or bytes-like): The path to the DOC file, or its content.
+
+        Yields:
+            str: The text of each paragraph of the main document, table cells included, in document order.
+
+        Notes:
+            - Reads the FIB of the `WordDocument` stream, then the piece table (`Clx`) from the table
+              stream it names, and decodes each piece as cp1252 or UTF-16.
+            - Field instructions, object anchors and footnote marks are dropped; encrypted files
+              yield nothing.
+            - Handles errors gracefully and prints error messages.
+        """
+
+    try:
+        with _open_compound_file(source) as compound_file:
+            word_document = compound_file.read_stream(_DOC_STREAM)
+            magic, flags = struct.unpack_from("<H8xH", word_document, 0)
+            if magic != _DOC_MAGIC:
+                raise ValueError("Not a Word 97 document")
+            if flags & _DOC_ENCRYPTED:
+                raise ValueError("Encrypted document")
+            table_stream = "1Table" if flags & _DOC_WHICH_TABLE_STREAM else "0Table"
+            table = compound_file.read_stream(table_stream)
+        text = _doc_visible_text(_doc_main_text(word_document, table))
+        paragraphs = _DOC_PARAGRAPH_MARKS.split(text.translate(_DOC_SPECIAL_CHARACTERS))
+        if paragraphs and not paragraphs[-1]:
+            paragraphs.pop()  # the document ends with a paragraph mark
+        yield from paragraphs
+    except Exception as e:
+        print(f"Error reading Word 97 file: {e}")
+
+
+def extract_text_from_doc(source):
+    """
+        Extracts text from a legacy Word 97-2003 (DOC) file.
+
+        Args:
+            source (str or bytes-like): The path to the DOC file, or its content.
+
+        Returns:
+            str: The extracted text, one paragraph per line.
+        """
+
+    return "\n".join(iter_text_from_doc(source))
+
+
+class Extractor(ABC):
+    """
+        Base class of the format extractors held by the registry.
+
+        Attributes:
+            name (str): Short name of the format.
+            extensions (tuple): File extensions handled, lowercase with the leading dot.
+            mime_types (tuple): MIME types handled.
+            separator (str): Inserted between the items of `iter_text` by `extract_text`.
+            requires (tuple): Modules the extractor imports on first use; loaded by `preload`.
+            fallback_requires (tuple): Modules only the object-model fallback of a `fast_xml`
+                extractor needs. Required when `FAST_XML_EXTRACTION` is off; otherwise the format
+                stays available without them.
+            fast_xml (bool): Whether the text depends on `FAST_XML_EXTRACTION` (direct XML parsing
+                and the object model do not give identical text).
+            container_format (bool): Whether files of the format are zip or OLE2 containers, which
+                `sniff_mime_type` always recognises. A file with one of its extensions is rejected
+                unless its content is sniffed as one of its `mime_types`.
+
+        Notes:
+            - Subclasses implement `iter_text`, importing their parser libraries inside it so they
+              are only loaded when a file of that format is actually extracted. A subclass without
+              it cannot be instantiated, so it fails when registered rather than mid-extraction.
+        """
+
+    name = ""
+    extensions = ()
+    mime_types = ()
+    separator = ""
+    requires = ()
+    fallback_requires = ()
+    fast_xml = False
+    container_format = False
+
+    @property
+    def cache_format(self):
+        """Format name used in extraction cache keys, with the extraction mode where it matters."""
+
+        if not self.fast_xml:
+            return self.name
+        return f"{self.name}-{'xml' if FAST_XML_EXTRACTION else 'object-model'}"
+
+    @abstractmethod
+    def iter_text(self, source):
+        """Yields the text of a file as it is parsed."""
+
+    def extract_text(self, source):
+        """Returns the whole text of a file."""
+
+        return self.separator.join(self.iter_text(source))
+
+    def preload(self):
+        """
+            Imports the extractor's parser libraries.
+
+            Raises:
+                ImportError: If a required library is missing. A missing `fallback_requires` library
+                    is only reported while `FAST_XML_EXTRACTION` is on.
+            """
+
+        for module in self.requires:
+            importlib.import_module(module)
+        for module in self.fallback_requires:
+            if not FAST_XML_EXTRACTION:
+                importlib.import_module(module)
+                continue
+            try:
+                importlib.import_module(module)
+            except ImportError as e:
+                print(f"Extractor '{self.name}' has no object-model fallback: {e}")
+
+
+EXTRACTORS = []
+_EXTRACTORS_BY_EXTENSION = {}
+_EXTRACTORS_BY_MIME_TYPE = {}
+
+
+def register_extractor(extractor_class):
+    """
+        Registers an `Extractor` subclass for its extensions and MIME types.
+
+        Args:
+            extractor_class (type): The extractor class; usable as a class decorator.
+
+        Returns:
+            type: The class itself.
+
+        Notes:
+            - A later registration for the same extension or MIME type replaces the earlier one,
+              so other modules can override the built-in extractors.
+        """
+
+    extractor = extractor_class()
+    EXTRACTORS.append(extractor)
+    for extension in extractor.extensions:
+        _EXTRACTORS_BY_EXTENSION[extension.lower()] = extractor
+    for mime_type in extractor.mime_types:
+        _EXTRACTORS_BY_MIME_TYPE[mime_type] = extractor
+    return extractor_class
+
+
+class UnsupportedFormatError(ValueError):
+    """Raised when no registered extractor can read a file."""
+
+
+def _sniff_ole2(source):
+    """
+        Tells Word 97 and PowerPoint 97 binaries apart from other OLE2 compound files by their streams.
+        """
+
+    from Qtip_fapi.ole2 import CompoundFileError
+
+    try:
+        with _open_compound_file(source) as compound_file:
+            if compound_file.has_stream(_DOC_STREAM):
+                return MIME_DOC
+            if compound_file.has_stream(_PPT_DOCUMENT_STREAM):
+                return MIME_PPT
+    except CompoundFileError:
+        pass
+    return MIME_OLE2
+
+
+def _sniff_zip(source):
+    """
+        Identifies OpenDocument and Office Open XML packages from their zip member names.
+        """
+
+    with _open_package(source) as package:
+        names = set(package.namelist())
+        if "mimetype" in names:
+            return package.read("mimetype").decode("ascii", "replace").strip()
+    if "[Content_Types].xml" in names:
+        if "word/document.xml" in names:
+            return MIME_DOCX
+        if "ppt/presentation.xml" in names:
+            return MIME_PPTX
+    return MIME_ZIP
+
+
+def sniff_mime_type(source):
+    """
+        Detects the format of a file from its first bytes, whatever its extension.
+
+        Args:
+            source (str or bytes-like): The path to the file, or its content.
+
+        Returns:
+            str: The MIME type, or None if the header is not recognised.
+
+        Notes:
+            - `%PDF-` in the first kilobyte: PDF.
+            - OLE2 signature: legacy Word (`.doc`) or PowerPoint (`.ppt`) binary, from the stream names
+              in the compound file directory.
+            - ZIP signature: ODF from its `mimetype` member, DOCX or PPTX from their main part.
+        """
+
+    with open_source(source) as file:
+        head = file.read(1024)
+    if head.startswith(_OLE2_SIGNATURE):
+        return _sniff_ole2(source)
+    if head.startswith(_ZIP_SIGNATURE):
+        try:
+            return _sniff_zip(source)
+        except zipfile.BadZipFile:
+            return None
+    if _PDF_SIGNATURE in head:
+        return MIME_PDF
+    return None
+
+
+def get_extractor(file_path=None, mime_type=None):
+    """
+        Looks up the extractor of a file, by MIME type if known, otherwise by extension.
+
+        Args:
+            file_path (str, optional): The path to the file.
+            mime_type (str, optional): The MIME type of the file, e.g. from `sniff_mime_type`.
+
+        Returns:
+            Extractor: The registered extractor.
+
+        Raises:
+            UnsupportedFormatError: If no extractor handles the file. A recognised MIME type without
+                an extractor is rejected rather than tried by extension, since that parse would fail.
+        """
+
+    if mime_type is not None:
+        if mime_type in _EXTRACTORS_BY_MIME_TYPE:
+            return _EXTRACTORS_BY_MIME_TYPE[mime_type]
+        raise UnsupportedFormatError(f"Unsupported file format: {mime_type}")
+    ext = os.path.splitext(file_path or "")[1].lower()
+    if ext in _EXTRACTORS_BY_EXTENSION:
+        return _EXTRACTORS_BY_EXTENSION[ext]
+    raise UnsupportedFormatError(f"Unsupported file type: {ext}")
+
+
+def find_extractor(source, file_path=None):
+    """
+        Picks the extractor of a file from its sniffed format, or from its extension when the header
+        is not recognised.
+
+        Args:
+            source (str or bytes-like): The path to the file, or its content.
+            file_path (str, optional): The file name, for the extension fallback of in-memory content.
+
+        Raises:
+            UnsupportedFormatError: If the file cannot be extracted.
+
+        Notes:
+            - Only formats without a fixed header (PDF, which tolerates leading junk, and registered
+              formats that are not containers) fall back to the extension. A file named like a zip
+              or OLE2 format (DOCX, PPTX, ODP, ODT, DOC, PPT) whose content is not sniffed as that
+              format, e.g. an HTML error page saved as `.docx`, is rejected before any parsing.
+        """
+
+    mime_type = sniff_mime_type(source)
+    path = source if is_path(source) else file_path
+    ext = os.path.splitext(path or "")[1].lower()
+    named_as = _EXTRACTORS_BY_EXTENSION.get(ext)
+    if named_as is not None and named_as.container_format and mime_type not in named_as.mime_types:
+        raise UnsupportedFormatError(
+            f"File content ({mime_type or 'unrecognised'}) does not match its extension: {ext}"
+        )
+    return get_extractor(path, mime_type)
+
+
+def preload_extractors():
+    """
+        Imports the parser libraries of every registered extractor that is installed.
+        """
+
+    for extractor in EXTRACTORS:
+        try:
+            extractor.preload()
+        except ImportError as e:
+            print(f"Extractor '{extractor.name}' unavailable: {e}")
+
+
+@register_extractor
+class PdfExtractor(Extractor):
+    name = "pdf"
+    extensions = ('.pdf',)
+    mime_types = (MIME_PDF,)
+    requires = ("PyPDF2",)
+
+    def iter_text(self, source):
+        return iter_text_from_pdf(source)
+
+
+@register_extractor
+class PptxExtractor(Extractor):
+    name = "pptx"
+    extensions = ('.pptx',)
+    mime_types = (MIME_PPTX,)
+    requires = ("lxml.etree",)
+    fallback_requires = ("pptx",)
+    fast_xml = True
+    container_format = True
+
+    def iter_text(self, source):
+        return iter_text_from_pptx(source)
+
+
+@register_extractor
+class DocxExtractor(Extractor):
+    name = "docx"
+    extensions = ('.docx',)
+    mime_types = (MIME_DOCX,)
+    separator = "\n"
+    requires = ("lxml.etree",)
+    fallback_requires = ("docx",)
+    fast_xml = True
+    container_format = True
+
+    def iter_text(self, source):
+        return iter_text_from_docx(source)
+
+
+@register_extractor
+class PptExtractor(Extractor):
+    name = "ppt"
+    extensions = ('.ppt', '.pps', '.pot')
+    mime_types = (MIME_PPT,)
+    requires = ("Qtip_fapi.ole2",)
+    container_format = True
+
+    def iter_text(self, source):
+        return iter_text_from_ppt(source)
+
+
+@register_extractor
+class DocExtractor(Extractor):
+    name = "doc"
+    extensions = ('.doc', '.dot')
+    mime_types = (MIME_DOC,)
+    separator = "\n"
+    requires = ("Qtip_fapi.ole2",)
+    container_format = True
+
+    def iter_text(self, source):
+        return iter_text_from_doc(source)
+
+
+@register_extractor
+class OdpExtractor(Extractor):
+    name = "odp"
+    extensions = ('.odp',)
+    mime_types = (MIME_ODP,)
+    separator = "\n"
+    requires = ("lxml.etree",)
+    container_format = True
+
+    def iter_text(self, source):
+        return iter_text_from_odp(source)
+
+
+@register_extractor
+class OdtExtractor(Extractor):
+    name = "odt"
+    extensions = ('.odt',)
+    mime_types = (MIME_ODT,)
+    separator = "\n"
+    requires = ("lxml.etree",)
+    container_format = True
+
+    def iter_text(self, source):
+        return iter_text_from_odt(source)
+
+
+def iter_text(source):
+    """
+        Yields the text of a file as it is parsed, based on its sniffed format.
+
+        Args:
+            source (str or bytes-like): The path to the file, or its content.
+
+        Yields:
+            str: Pages for PDF, slides for PPT, PPTX and ODP, paragraphs for DOC, DOCX and ODT.
+
+        Raises:
+            UnsupportedFormatError: If the file type is unsupported (a `ValueError`).
+
+        Notes:
+            - `extract_text` returns the same items joined with the extractor's `separator`.
+        """
+
+    return find_extractor(source).iter_text(source)
+
+
+def extract_text(source):
+    """
+        Extracts text from a file based on its format.
+
+        Args:
+            source (str or bytes-like): The path to the file, or its content.
 
         Returns:
             str: The extracted text from the file.
 
         Raises:
-            ValueError: If the file type is unsupported.
+            UnsupportedFormatError: If the file type is unsupported (a `ValueError`).
 
         Notes:
-            - Automatically determines the file type based on its extension.
-            - Supports DOCX, PDF, PPTX, and ODP formats.
-        """
-
-    ext = os.path.splitext(file_path)[1].lower()
-    if ext in ['.doc', '.docx']:
-        return extract_text_from_docx(file_path)
-    elif ext == '.pdf':
-        return extract_text_from_pdf(file_path)
-    elif ext in ['.ppt', '.pptx']:
-        return extract_text_from_pptx(file_path)
-    elif ext == '.odp':
-        return extract_text_from_odp(file_path)
-    else:
-        raise ValueError(f"Unsupported file type: {ext}")
+            - Determines the file type from its header bytes (`sniff_mime_type`) and dispatches
+              through the extractor registry (see `find_extractor`); only formats without a fixed
+              header, such as PDF, fall back to the extension.
+            - Files in a recognised but unsupported format (e.g. an OLE2 file that is neither Word nor
+              PowerPoint) are rejected before any parsing.
+            - Supports DOCX, DOC, PDF, PPTX, PPT, ODP and ODT formats, plus any format registered with
+              `register_extractor`.
+            - A path is mapped once (`map_file`) and the mapping shared by format sniffing and parsing.
+        """
+
+    if is_path(source):
+        with map_file(source) as data:
+            return find_extractor(data, source).extract_text(data)
+    return find_extractor(source).extract_text(source)
 
 
 # file_path = "./assets/test.pdf"
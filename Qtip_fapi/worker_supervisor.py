@@ -0,0 +1,146 @@
+"""
+Consumer Worker Supervisor Module
+
+This module runs the RabbitMQ receiver as a pool of supervised worker processes, so CPU-bound text
+extraction spreads over every core instead of a single process behind the GIL.
+
+Features:
+- Starts N consumer processes (one per core by default).
+- Restarts workers that exit unexpectedly, with exponential backoff for workers that keep crashing.
+  A worker exiting with code 0 has drained on purpose (e.g. on Ctrl+C, which reaches every process
+  of the group) and is not restarted.
+- Drains workers on shutdown: SIGTERM lets each receiver finish and acknowledge in-flight messages
+  before the process is killed after a timeout.
+
+Attributes:
+    CONSUMER_WORKERS (int): Number of consumer processes; defaults to the number of CPU cores.
+    SHUTDOWN_TIMEOUT (float): Seconds a worker may take to drain before it is killed.
+"""
+
+import multiprocessing
+import os
+import time
+from threading import Event, Thread
+
+CONSUMER_WORKERS = int(os.environ.get("CONSUMER_WORKERS", os.cpu_count() or 1))
+SHUTDOWN_TIMEOUT = float(os.environ.get("CONSUMER_SHUTDOWN_TIMEOUT", 30))
+
+
+def run_consumer_worker():
+    """
+    Entry point of a consumer worker process.
+
+    Notes:
+        - `receiver` is imported here, in the child, so the FastAPI process does not load pika or
+          the text extraction libraries.
+    """
+
+    from Qtip_fapi import receiver
+
+    receiver.main()
+
+
+class WorkerSupervisor:
+    """
+    Keeps a fixed number of consumer processes running.
+
+    Args:
+        target (callable): Function run by every worker process; must be importable by name.
+        workers (int): Number of worker processes.
+        shutdown_timeout (float): Seconds a worker may take to drain on `stop` before it is killed.
+        min_uptime (float): Workers exiting sooner than this after start count as crash-looping.
+        max_restart_delay (float): Upper bound of the restart backoff, in seconds.
+    """
+
+    def __init__(self, target=run_consumer_worker, workers=CONSUMER_WORKERS, shutdown_timeout=SHUTDOWN_TIMEOUT,
+                 min_uptime=5.0, max_restart_delay=30.0):
+        self.target = target
+        self.workers = max(1, workers)
+        self.shutdown_timeout = shutdown_timeout
+        self.min_uptime = min_uptime
+        self.max_restart_delay = max_restart_delay
+        self._context = multiprocessing.get_context("spawn")
+        self._processes = [None] * self.workers
+        self._started_at = [0.0] * self.workers
+        self._restart_delay = [0.0] * self.workers
+        self._restart_at = [0.0] * self.workers
+        self._exited = [False] * self.workers
+        self._stopping = Event()
+        self._monitor = None
+
+    def start(self):
+        """
+        Starts every worker and the monitor thread that restarts crashed workers.
+        """
+
+        for slot in range(self.workers):
+            self._spawn(slot)
+        self._monitor = Thread(target=self._watch, name="consumer-supervisor", daemon=True)
+        self._monitor.start()
+        print(f"Started {self.workers} consumer worker(s).")
+
+    def stop(self):
+        """
+        Drains and stops every worker.
+
+        Actions:
+            - Stops restarting workers.
+            - Sends SIGTERM so each receiver stops consuming and settles in-flight messages.
+            - Kills workers still running after `shutdown_timeout` seconds.
+        """
+
+        self._stopping.set()
+        if self._monitor is not None:
+            self._monitor.join()
+
+        running = [process for process in self._processes if process is not None and process.is_alive()]
+        for process in running:
+            process.terminate()
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        for process in running:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                print(f"Consumer worker {process.name} did not drain in time, killing it.")
+                process.kill()
+                process.join()
+        print("Consumer workers stopped.")
+
+    @property
+    def alive(self):
+        """int: Number of worker processes currently running."""
+
+        return sum(1 for process in self._processes if process is not None and process.is_alive())
+
+    def _spawn(self, slot):
+        process = self._context.Process(target=self.target, name=f"qtip-consumer-{slot}", daemon=False)
+        process.start()
+        self._processes[slot] = process
+        self._started_at[slot] = time.monotonic()
+        self._restart_at[slot] = 0.0
+        self._exited[slot] = False
+
+    def _watch(self):
+        while not self._stopping.wait(0.5):
+            now = time.monotonic()
+            for slot, process in enumerate(self._processes):
+                if process.is_alive() or self._exited[slot]:
+                    continue
+                if process.exitcode == 0:
+                    self._exited[slot] = True
+                    print(f"Consumer worker {process.name} exited cleanly, not restarting it.")
+                elif not self._restart_at[slot]:
+                    self._schedule_restart(slot, process, now)
+                elif now >= self._restart_at[slot]:
+                    if self._stopping.is_set():
+                        return
+                    self._spawn(slot)
+
+    def _schedule_restart(self, slot, process, now):
+        if now - self._started_at[slot] < self.min_uptime:
+            self._restart_delay[slot] = min(self.max_restart_delay, max(1.0, self._restart_delay[slot] * 2))
+        else:
+            self._restart_delay[slot] = 0.0
+        self._restart_at[slot] = now + self._restart_delay[slot]
+        print(f"Consumer worker {process.name} exited with code {process.exitcode}, "
+              f"restarting in {self._restart_delay[slot]:.0f}s.")
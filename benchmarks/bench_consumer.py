@@ -0,0 +1,474 @@
+"""
+Consumer Throughput Benchmark
+
+Drives the receiver end to end without RabbitMQ or the FastAPI service: an in-memory stand-in for the
+broker channel delivers messages to `start_learning_callback` / `question_callback` (or, in asyncio
+mode, to `AsyncConsumer`) with real prefetch, delivery tag and ack semantics, and the handlers fetch
+their records from a local stub of the FastAPI endpoints through the receiver's pooled HTTP client.
+
+Messages are published at a controlled rate, and for every queue the benchmark reports:
+- end-to-end latency percentiles, from publish to the broker receiving the ack (ack batching included),
+- ack rate (acknowledged messages per second of consuming),
+- backlog growth: ready messages sampled while publishing, with the growth rate in messages/s
+  (positive means the consumer falls behind the publish rate),
+- peak unacknowledged deliveries, rejections and redeliveries.
+
+Receiver settings are applied through its environment variables before it is imported, so prefetch
+windows, HTTP pool size, question batch size and consumer mode can be compared on one machine.
+
+Usage:
+    python -m benchmarks.bench_consumer [--queue question|start_learning|both] [--messages 2000]
+        [--rate 500] [--mode threaded|asyncio] [--question-prefetch 32] [--start-learning-prefetch 4]
+        [--http-pool-size N] [--question-batch-size N] [--api http|inline] [--api-latency-ms 5]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from Qtip_fapi.stats import percentile
+
+QUEUE_NAMES = {"question": "question_Queue", "start_learning": "start_learning_Queue"}
+
+
+class _Delivery:
+    """Stand-in for pika's `Basic.Deliver` method frame."""
+
+    __slots__ = ("delivery_tag", "redelivered")
+
+    def __init__(self, delivery_tag, redelivered):
+        self.delivery_tag = delivery_tag
+        self.redelivered = redelivered
+
+
+class BrokerLoop:
+    """
+    Event loop thread playing the role of a connection's IO loop.
+
+    Notes:
+        - Offers the two connection methods the receiver uses: `add_callback_threadsafe` and
+          `call_later`. Channel methods must run on this thread, as with pika.
+    """
+
+    def __init__(self, name):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self.thread.start()
+
+    def add_callback_threadsafe(self, callback):
+        self.loop.call_soon_threadsafe(callback)
+
+    def call_later(self, delay, callback):
+        return self.loop.call_later(delay, callback)
+
+    def run(self, coroutine):
+        """Runs a coroutine on the loop from another thread and returns its result."""
+
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+class InMemoryChannel:
+    """
+    In-memory queue with the channel semantics the consumer relies on.
+
+    Args:
+        broker (BrokerLoop): The loop the channel lives on; also exposed as `connection`.
+        queue (str): Queue name.
+
+    Notes:
+        - Deliveries stop when `prefetch_count` messages are unacknowledged and resume on ack/nack.
+        - Delivery tags increase per channel; requeued messages are redelivered with a new tag.
+        - `basic_ack(multiple=True)` settles every outstanding tag up to the given one.
+    """
+
+    def __init__(self, broker, queue):
+        self.connection = broker
+        self.queue = queue
+        self.is_open = True
+        self.prefetch_count = 0
+        self.on_message = None
+        self._ready = deque()
+        self._unacked = {}
+        self._next_tag = 0
+        self.published = 0
+        self.acked = 0
+        self.rejected = 0
+        self.redelivered = 0
+        self.peak_unacked = 0
+        self.latencies = []
+        self.first_publish = None
+        self.last_settle = None
+        self.done = threading.Event()
+        self.expected = 0
+
+    def queue_declare(self, queue=None, durable=False, callback=None):
+        if callback is not None:
+            self.connection.loop.call_soon(callback, None)
+
+    def basic_qos(self, prefetch_count=0, callback=None):
+        self.prefetch_count = prefetch_count
+        if callback is not None:
+            self.connection.loop.call_soon(callback, None)
+
+    def basic_consume(self, queue=None, on_message_callback=None):
+        self.on_message = on_message_callback
+        self._schedule_pump()
+        return f"ctag-{self.queue}"
+
+    def publish(self, body):
+        """Appends a message to the queue; runs on the broker loop."""
+
+        now = time.perf_counter()
+        if self.first_publish is None:
+            self.first_publish = now
+        self.published += 1
+        self._ready.append((body, now, False))
+        self._schedule_pump()
+
+    @property
+    def backlog(self):
+        return len(self._ready)
+
+    def _schedule_pump(self):
+        self.connection.loop.call_soon(self._pump)
+
+    def _pump(self):
+        while self.on_message and self._ready and (
+                not self.prefetch_count or len(self._unacked) < self.prefetch_count):
+            body, published_at, redelivered = self._ready.popleft()
+            self._next_tag += 1
+            self._unacked[self._next_tag] = (body, published_at)
+            self.peak_unacked = max(self.peak_unacked, len(self._unacked))
+            self.on_message(self, _Delivery(self._next_tag, redelivered), None, body)
+
+    def _settle(self, delivery_tag, multiple):
+        tags = [tag for tag in self._unacked if tag <= delivery_tag] if multiple else [delivery_tag]
+        return [self._unacked.pop(tag) for tag in tags if tag in self._unacked]
+
+    def _finish(self):
+        self.last_settle = time.perf_counter()
+        if self.acked + self.rejected >= self.expected:
+            self.done.set()
+        self._schedule_pump()
+
+    def basic_ack(self, delivery_tag=0, multiple=False):
+        now = time.perf_counter()
+        for _, published_at in self._settle(delivery_tag, multiple):
+            self.acked += 1
+            self.latencies.append(now - published_at)
+        self._finish()
+
+    def basic_nack(self, delivery_tag=0, multiple=False, requeue=True):
+        for body, published_at in self._settle(delivery_tag, multiple):
+            if requeue:
+                self.redelivered += 1
+                self._ready.appendleft((body, published_at, True))
+            else:
+                self.rejected += 1
+        self._finish()
+
+
+class _ApiStub(BaseHTTPRequestHandler):
+    """Answers the receiver's `/knowledgebase/{id}`, `/question/{id}` and `/question/batch` requests."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # like uvicorn; otherwise headers and body wait on delayed ACKs
+    latency = 0.0
+    files_per_presentation = 1
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        if self.path.startswith("/knowledgebase/"):
+            payload = {"files": [{"filepath": f"file-{index}.pdf"} for index in range(self.files_per_presentation)]}
+        elif self.path.startswith("/question/"):
+            payload = {"question": f"What does slide {self.path.rsplit('/', 1)[-1]} mean?"}
+        else:
+            self.send_error(404)
+            return
+        self._send_json(payload)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        time.sleep(self.latency)
+        if self.path != "/question/batch":
+            self.send_error(404)
+            return
+        self._send_json({
+            "questions": {question_id: {"question": f"What does slide {question_id} mean?"}
+                          for question_id in request.get("question_ids", [])},
+            "missing": [],
+        })
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class InlineDataSource:
+    """Data source answering in-process after `latency` seconds, without HTTP."""
+
+    def __init__(self, latency, files_per_presentation):
+        self.latency = latency
+        self.files_per_presentation = files_per_presentation
+
+    def fetch_presentation_files(self, presentation_id):
+        time.sleep(self.latency)
+        return [{"filepath": f"file-{index}.pdf"} for index in range(self.files_per_presentation)]
+
+    def fetch_question(self, question_id):
+        time.sleep(self.latency)
+        return {"question": f"What does slide {question_id} mean?"}
+
+    def fetch_questions(self, question_ids):
+        time.sleep(self.latency)
+        return {question_id: {"question": f"What does slide {question_id} mean?"} for question_id in question_ids}
+
+    def close(self):
+        pass
+
+
+async def _publish(channel, messages, rate, samples, sample_interval):
+    """Publishes `messages` messages at `rate` per second (0: all at once), sampling the backlog."""
+
+    start = time.perf_counter()
+    next_sample = start
+    for index in range(messages):
+        if rate:
+            delay = start + index / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        now = time.perf_counter()
+        if now >= next_sample:
+            samples.append((now - start, channel.backlog))
+            next_sample = now + sample_interval
+        channel.publish(f"{channel.queue}-{index}".encode())
+    samples.append((time.perf_counter() - start, channel.backlog))
+
+
+def _growth_rate(samples):
+    """Least-squares slope of the backlog over time, in messages per second."""
+
+    if len(samples) < 2:
+        return 0.0
+    mean_t = sum(t for t, _ in samples) / len(samples)
+    mean_b = sum(b for _, b in samples) / len(samples)
+    variance = sum((t - mean_t) ** 2 for t, _ in samples)
+    if not variance:
+        return 0.0
+    return sum((t - mean_t) * (b - mean_b) for t, b in samples) / variance
+
+
+def configure_receiver(args):
+    """Sets the receiver's environment variables from the arguments, then imports it."""
+
+    os.environ["CONSUMER_MODE"] = args.mode
+    if args.question_prefetch:
+        os.environ["QUESTION_PREFETCH"] = str(args.question_prefetch)
+    if args.start_learning_prefetch:
+        os.environ["START_LEARNING_PREFETCH"] = str(args.start_learning_prefetch)
+    if args.http_pool_size:
+        os.environ["HTTP_POOL_SIZE"] = str(args.http_pool_size)
+    if args.question_batch_size:
+        os.environ["QUESTION_BATCH_SIZE"] = str(args.question_batch_size)
+
+    from Qtip_fapi import receiver
+
+    return receiver
+
+
+def open_data_source(receiver, args):
+    """Starts the FastAPI stub and returns `(data_source, server)`; `server` is None inline."""
+
+    latency = args.api_latency_ms / 1000
+    if args.api == "inline":
+        return InlineDataSource(latency, args.files_per_presentation), None
+
+    from Qtip_fapi.data_access import HttpDataSource, PooledHttpClient
+
+    handler = type("ApiStub", (_ApiStub,), {"latency": latency, "files_per_presentation": args.files_per_presentation})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="api-stub", daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    client = PooledHttpClient(
+        pool_size=receiver.HTTP_POOL_SIZE,
+        timeout=(receiver.HTTP_CONNECT_TIMEOUT, receiver.HTTP_READ_TIMEOUT),
+        retries=receiver.HTTP_RETRIES,
+        backoff=receiver.HTTP_RETRY_BACKOFF,
+    )
+    return HttpDataSource(f"{base}/knowledgebase", f"{base}/question", client=client), server
+
+
+def attach_consumers(receiver, queues, mode):
+    """
+    Wires the receiver to in-memory channels the way `start_*_consumer` / `AsyncConsumer` do.
+
+    Returns:
+        tuple: `(channels, brokers)`, the channel of each queue and the loops to close afterwards.
+    """
+
+    callbacks = {
+        receiver.START_LEARNING_QUEUE: (receiver.start_learning_callback, receiver.handle_start_learning_message),
+        receiver.QUESTION_QUEUE: (receiver.question_callback, receiver.handle_question_message),
+    }
+    channels = {}
+    brokers = []
+    if mode == "asyncio":
+        from Qtip_fapi.async_consumer import AsyncConsumer
+
+        broker = BrokerLoop("broker-asyncio")
+        brokers.append(broker)
+        consumer = AsyncConsumer(receiver.RABBITMQ_HOST, {
+            queue: (callbacks[queue][1], receiver.in_flight[queue]) for queue in queues
+        }, executor=receiver.executor, open_ack_batcher=receiver.open_ack_batcher)
+        for queue in queues:
+            channel = InMemoryChannel(broker, queue)
+            broker.loop.call_soon_threadsafe(consumer.attach_channel, queue, channel)
+            channels[queue] = channel
+        return channels, brokers
+
+    for queue in queues:
+        broker = BrokerLoop(f"broker-{queue}")
+        brokers.append(broker)
+        channel = InMemoryChannel(broker, queue)
+        channel.basic_qos(prefetch_count=receiver.in_flight[queue].size)
+        receiver.open_ack_batcher(queue, channel, broker.call_later)
+        broker.loop.call_soon_threadsafe(channel.basic_consume, queue, callbacks[queue][0])
+        channels[queue] = channel
+    return channels, brokers
+
+
+def report(channel, samples, publish_seconds):
+    """Prints the results of one queue and returns them as a dict."""
+
+    consumed = (channel.last_settle or time.perf_counter()) - channel.first_publish
+    latencies = channel.latencies or [0.0]
+    result = {
+        "queue": channel.queue,
+        "published": channel.published,
+        "acked": channel.acked,
+        "rejected": channel.rejected,
+        "redelivered": channel.redelivered,
+        "publish_rate": round(channel.published / publish_seconds, 1) if publish_seconds else None,
+        "ack_rate": round(channel.acked / consumed, 1) if consumed else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p90_ms": round(percentile(latencies, 0.90) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2),
+        "peak_backlog": max(backlog for _, backlog in samples),
+        "backlog_growth_per_s": round(_growth_rate(samples), 1),
+        "peak_unacked": channel.peak_unacked,
+    }
+    print(f"\n{channel.queue}:")
+    print(f"  published {result['published']} at {result['publish_rate']} msg/s, acked {result['acked']} "
+          f"({result['ack_rate']} msg/s), rejected {result['rejected']}, redelivered {result['redelivered']}")
+    print(f"  latency p50 {result['p50_ms']} ms, p90 {result['p90_ms']} ms, p99 {result['p99_ms']} ms, "
+          f"max {result['max_ms']} ms")
+    print(f"  backlog peak {result['peak_backlog']}, growth {result['backlog_growth_per_s']:+} msg/s while "
+          f"publishing, peak unacked {result['peak_unacked']}")
+    return result
+
+
+def run(args):
+    """
+    Runs one load test with the given arguments.
+
+    Returns:
+        list: One result dict per queue.
+    """
+
+    receiver = configure_receiver(args)
+    queues = [receiver.START_LEARNING_QUEUE, receiver.QUESTION_QUEUE] if args.queue == "both" \
+        else [QUEUE_NAMES[args.queue]]
+    receiver.data_source, server = open_data_source(receiver, args)
+    if receiver.START_LEARNING_QUEUE in queues:
+        from Qtip_fapi.extraction import ExtractionExecutor
+
+        receiver.extraction_executor = ExtractionExecutor()
+        receiver.extraction_executor.warm_up()
+
+    print(f"mode={args.mode} windows={ {queue: receiver.in_flight[queue].size for queue in queues} } "
+          f"threads={receiver.executor._max_workers} http_pool={receiver.HTTP_POOL_SIZE} "
+          f"question_batch={receiver.QUESTION_BATCH_SIZE} api={args.api} "
+          f"latency={args.api_latency_ms}ms messages={args.messages} rate={args.rate or 'unbounded'}")
+
+    channels, brokers = attach_consumers(receiver, queues, args.mode)
+    samples = {queue: [] for queue in queues}
+    results = []
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            started = time.perf_counter()
+            publishers = []
+            for queue, channel in channels.items():
+                channel.expected = args.messages
+                publishers.append(asyncio.run_coroutine_threadsafe(
+                    _publish(channel, args.messages, args.rate, samples[queue], args.sample_interval),
+                    channel.connection.loop,
+                ))
+            for publisher in publishers:
+                publisher.result()
+            publish_seconds = time.perf_counter() - started
+            for channel in channels.values():
+                channel.done.wait(args.timeout)
+        for queue, channel in channels.items():
+            if not channel.done.is_set():
+                print(f"\n{queue}: timed out after {args.timeout}s with {channel.acked + channel.rejected} "
+                      f"of {args.messages} messages settled")
+            results.append(report(channel, samples[queue], publish_seconds))
+    finally:
+        for broker in brokers:
+            broker.close()
+        receiver.executor.shutdown(wait=False, cancel_futures=True)
+        receiver.data_source.close()
+        if server is not None:
+            server.shutdown()
+        if receiver.extraction_executor is not None:
+            receiver.extraction_executor.shutdown(wait=False)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queue", choices=["question", "start_learning", "both"], default="question")
+    parser.add_argument("--messages", type=int, default=2000, help="messages published per queue")
+    parser.add_argument("--rate", type=float, default=500, help="messages/s per queue; 0 publishes all at once")
+    parser.add_argument("--mode", choices=["threaded", "asyncio"], default="threaded")
+    parser.add_argument("--question-prefetch", type=int)
+    parser.add_argument("--start-learning-prefetch", type=int)
+    parser.add_argument("--http-pool-size", type=int)
+    parser.add_argument("--question-batch-size", type=int, help="question lookups per batch; 1 disables batching")
+    parser.add_argument("--api", choices=["http", "inline"], default="http",
+                        help="serve the handlers' fetches from a local HTTP stub or in-process")
+    parser.add_argument("--api-latency-ms", type=float, default=5.0, help="time the API stub takes to answer")
+    parser.add_argument("--files-per-presentation", type=int, default=1)
+    parser.add_argument("--sample-interval", type=float, default=0.1, help="seconds between backlog samples")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds to wait for the queues to drain")
+    parser.add_argument("--json", metavar="PATH", help="also write the results to a JSON file")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"settings": vars(args), "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Extraction Benchmark
+
+Measures text extraction over the fixtures in `Qtip_fapi/assets` and over synthetic documents of
+increasing size. Every file is extracted with the generic `extract_text` and with its format's
+`extract_text_from_*` function, each in a fresh process so peak RSS is attributable to that file.
+
+Reported per file and function:
+- units (pages, slides or paragraphs, as yielded by `iter_text`) and file size,
+- p50 / p99 latency over `--repeat` runs,
+- throughput in units/s and MB/s,
+- peak RSS of the process that ran it.
+
+Results can be saved as a JSON baseline and compared with a later run; rows whose p50 grew by more
+than `--threshold` and by at least `--min-delta-ms` (so sub-millisecond jitter is not flagged) are
+reported as regressions and make the command exit with status 1.
+
+Usage:
+    python -m benchmarks.bench_extract [--sizes 50 500] [--repeat 5] [--save baseline.json]
+    python -m benchmarks.bench_extract --compare baseline.json [--threshold 0.2] [--min-delta-ms 2]
+"""
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import make_docx, make_pdf, make_pptx
+from Qtip_fapi.stats import percentile
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Qtip_fapi", "assets")
+
+SYNTHETIC = {
+    "pdf": make_pdf,
+    "pptx": make_pptx,
+    "docx": make_docx,
+}
+
+
+def _peak_rss_mb():
+    """
+    Returns the peak resident memory of this process, in megabytes.
+
+    Notes:
+        - Reads `VmHWM` on Linux: `ru_maxrss` survives `exec`, so a spawned child would report at
+          least the peak of the parent that forked it.
+    """
+
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB elsewhere
+
+
+def _measure(path, function_name, repeat):
+    """Runs in a fresh process: extracts `path` `repeat` times with `function_name` and returns the row."""
+
+    from Qtip_fapi import textExtract
+
+    extractor = textExtract.find_extractor(path)
+    function = getattr(textExtract, function_name or f"extract_text_from_{extractor.name}")
+    units = sum(1 for _ in extractor.iter_text(path))
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(path)
+        timings.append(time.perf_counter() - start)
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    total = sum(timings)
+    return {
+        "format": extractor.name,
+        "function": function.__name__,
+        "units": units,
+        "size_mb": round(size_mb, 3),
+        "p50_ms": round(percentile(timings, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(timings, 0.99) * 1000, 3),
+        "units_per_s": round(units * repeat / total, 1) if total else None,
+        "mb_per_s": round(size_mb * repeat / total, 2) if total else None,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def corpus(workdir, sizes):
+    """
+    Lists the files to benchmark: every supported asset, then synthetic documents of each size.
+
+    Returns:
+        list: `(label, path)` pairs.
+    """
+
+    from Qtip_fapi.textExtract import UnsupportedFormatError, find_extractor
+
+    files = []
+    for name in sorted(os.listdir(ASSETS_DIR)):
+        path = os.path.join(ASSETS_DIR, name)
+        try:
+            find_extractor(path)
+        except (UnsupportedFormatError, OSError):
+            continue
+        files.append((name, path))
+    for extension, make in SYNTHETIC.items():
+        for size in sizes:
+            files.append((f"synthetic_{size}.{extension}", make(os.path.join(workdir, f"synthetic_{size}.{extension}"), size)))
+    return files
+
+
+def run(sizes, repeat):
+    """
+    Runs the benchmark and prints one row per file and function.
+
+    Returns:
+        list: The result rows, as saved in a baseline.
+    """
+
+    context = multiprocessing.get_context("spawn")
+    rows = []
+    print(f"{'file':<28} {'function':<24} {'units':>6} {'MB':>7} {'p50 ms':>9} {'p99 ms':>9} "
+          f"{'units/s':>9} {'MB/s':>7} {'RSS MB':>7}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for label, path in corpus(workdir, sizes):
+            for function_name in ("extract_text", None):
+                with context.Pool(1) as pool:
+                    row = pool.apply(_measure, (path, function_name, repeat))
+                row["file"] = label
+                rows.append(row)
+                print(f"{label:<28} {row['function']:<24} {row['units']:>6} {row['size_mb']:>7.2f} "
+                      f"{row['p50_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['units_per_s'] or 0:>9.1f} "
+                      f"{row['mb_per_s'] or 0:>7.2f} {row['peak_rss_mb']:>7.1f}")
+    return rows
+
+
+def save(rows, path, sizes, repeat):
+    """Writes the rows and the run settings to a JSON baseline."""
+
+    baseline = {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "sizes": sizes,
+        "repeat": repeat,
+        "results": rows,
+    }
+    with open(path, "w") as file:
+        json.dump(baseline, file, indent=2)
+    print(f"\nBaseline saved to {path}")
+
+
+def compare(rows, path, threshold, min_delta_ms):
+    """
+    Compares the rows with a saved baseline and prints the p50 change of every row found in both.
+
+    Returns:
+        list: Labels of the rows whose p50 grew by more than `threshold` (e.g. 0.2 for 20%) and by
+            more than `min_delta_ms`.
+    """
+
+    with open(path) as file:
+        baseline = {(row["file"], row["function"]): row for row in json.load(file)["results"]}
+    regressions = []
+    print(f"\nCompared with {path} (regression threshold {threshold:.0%}):")
+    for row in rows:
+        previous = baseline.get((row["file"], row["function"]))
+        if previous is None or not previous["p50_ms"]:
+            continue
+        change = row["p50_ms"] / previous["p50_ms"] - 1
+        slower = change > threshold and row["p50_ms"] - previous["p50_ms"] > min_delta_ms
+        flag = "REGRESSION" if slower else ""
+        print(f"{row['file']:<28} {row['function']:<24} {previous['p50_ms']:>9.2f} -> {row['p50_ms']:>9.2f} ms "
+              f"{change:>+8.1%} {flag}")
+        if flag:
+            regressions.append(f"{row['file']} {row['function']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare with a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p50 growth reported as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="smallest p50 growth, in ms, reported")
+    args = parser.parse_args()
+
+    rows = run(sorted(args.sizes), args.repeat)
+    if args.save:
+        save(rows, args.save, sorted(args.sizes), args.repeat)
+    if args.compare:
+        regressions = compare(rows, args.compare, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): " + ", ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
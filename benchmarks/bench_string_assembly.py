@@ -0,0 +1,69 @@
+"""
+String Assembly Micro-Benchmark
+
+Checks that text extraction scales linearly with document size. Synthetic PPTX decks and PDFs of
+increasing size are extracted and the time per slide/page is printed for every size: with linear
+string assembly it stays flat as the document grows, quadratic copying would make it grow with N.
+
+Usage:
+    python -m benchmarks.bench_string_assembly [--sizes 125 250 500 1000] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_pdf, make_pptx
+from Qtip_fapi.textExtract import extract_text_from_pdf, extract_text_from_pptx
+
+FORMATS = {
+    "pptx": (make_pptx, extract_text_from_pptx, "slide"),
+    "pdf": (make_pdf, extract_text_from_pdf, "page"),
+}
+
+
+def best_time(function, path, repeat):
+    """Returns the fastest of `repeat` runs of `function(path)`, in seconds."""
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(sizes, repeat):
+    """
+    Runs the benchmark and prints one row per format and size.
+
+    Returns:
+        dict: `{format: [(size, seconds), ...]}`.
+    """
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, (make, extract, unit) in FORMATS.items():
+            rows = results.setdefault(name, [])
+            print(f"\n{name}: {'N':>6} {'total (s)':>10} {'ms/' + unit:>10} {'vs smallest':>12}")
+            for size in sizes:
+                path = make(os.path.join(workdir, f"synthetic_{size}.{name}"), size)
+                seconds = best_time(extract, path, repeat)
+                rows.append((size, seconds))
+                per_unit = seconds / size
+                baseline = rows[0][1] / rows[0][0]
+                print(f"{'':5} {size:>6} {seconds:>10.3f} {per_unit * 1000:>10.3f} {per_unit / baseline:>11.2f}x")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[125, 250, 500, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(sorted(args.sizes), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+Synthetic Document Generators
+
+Builds documents of a chosen size for the extraction benchmarks, so scaling can be measured on inputs
+far larger than the fixtures in `Qtip_fapi/assets`.
+
+Features:
+- `make_pdf`: a PDF with N text pages, written byte by byte (no PDF writer dependency).
+- `make_pptx`: a PowerPoint deck with N title + body slides, written with `python-pptx`.
+- `make_docx`: a Word document with N paragraphs, written with `python-docx`.
+- `make_ppt97`: a PowerPoint 97-2003 deck whose slide text is kept in the slide list, the way
+  PowerPoint 97-2003 saves placeholder text, written byte by byte.
+- `make_doc97`: a Word 97-2003 document with 8-bit and 16-bit text pieces, written byte by byte.
+
+Usage:
+    make_pdf("/tmp/big.pdf", pages=1000)
+    make_pptx("/tmp/big.pptx", slides=1000)
+    make_docx("/tmp/big.docx", paragraphs=10000)
+    make_ppt97("/tmp/big.ppt", slides=1000)
+    make_doc97("/tmp/big.doc", paragraphs=10000)
+"""
+
+import struct
+
+SENTENCE = "The quick brown fox jumps over the lazy dog while the lecturer explains slide"
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(path, pages, lines_per_page=30):
+    """
+    Writes a PDF with `pages` pages of text.
+
+    Args:
+        path (str): Output file path.
+        pages (int): Number of pages.
+        lines_per_page (int): Lines of text on every page.
+
+    Returns:
+        str: The output path.
+    """
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_numbers = []
+    for page in range(pages):
+        lines = [b"BT /F1 10 Tf 12 TL 50 780 Td"]
+        for line in range(lines_per_page):
+            text = _pdf_escape(f"{SENTENCE} {page + 1} line {line + 1}.")
+            lines.append(f"({text}) Tj T*".encode("latin-1"))
+        lines.append(b"ET")
+        stream = b"\n".join(lines)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_number = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_number
+        )
+        page_numbers.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % number for number in page_numbers)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    output = [b"%PDF-1.4\n"]
+    offsets = []
+    position = len(output[0])
+    for number, body in enumerate(objects, start=1):
+        chunk = b"%d 0 obj\n" % number + body + b"\nendobj\n"
+        offsets.append(position)
+        output.append(chunk)
+        position += len(chunk)
+    xref = [b"xref\n0 %d\n" % (len(objects) + 1), b"0000000000 65535 f \n"]
+    xref.extend(b"%010d 00000 n \n" % offset for offset in offsets)
+    output.extend(xref)
+    output.append(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, position))
+
+    with open(path, "wb") as file:
+        file.write(b"".join(output))
+    return path
+
+
+def make_pptx(path, slides, bullets_per_slide=5):
+    """
+    Writes a PowerPoint deck with `slides` slides.
+
+    Args:
+        path (str): Output file path.
+        slides (int): Number of slides.
+        bullets_per_slide (int): Bullet paragraphs in the body of every slide.
+
+    Returns:
+        str: The output path.
+    """
+
+    from pptx import Presentation
+
+    presentation = Presentation()
+    layout = presentation.slide_layouts[1]  # Title and Content
+    for number in range(slides):
+        slide = presentation.slides.add_slide(layout)
+        slide.shapes.title.text = f"Slide {number + 1}"
+        body = slide.placeholders[1].text_frame
+        body.text = f"{SENTENCE} {number + 1}."
+        for bullet in range(1, bullets_per_slide):
+            body.add_paragraph().text = f"Point {bullet}: {SENTENCE} {number + 1}."
+    presentation.save(path)
+    return path
+
+
+def make_docx(path, paragraphs, headings_every=20):
+    """
+    Writes a Word document with `paragraphs` body paragraphs.
+
+    Args:
+        path (str): Output file path.
+        paragraphs (int): Number of body paragraphs.
+        headings_every (int): A heading is inserted before every `headings_every` paragraphs.
+
+    Returns:
+        str: The output path.
+    """
+
+    from docx import Document
+
+    document = Document()
+    for number in range(paragraphs):
+        if number % headings_every == 0:
+            document.add_heading(f"Section {number // headings_every + 1}", level=1)
+        document.add_paragraph(f"{SENTENCE} {number + 1}.")
+    document.save(path)
+    return path
+
+
+_OLE2_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+_CFB_SECTOR = 512
+_CFB_MINI_STREAM_CUTOFF = 4096
+_CFB_END_OF_CHAIN = 0xFFFFFFFE
+_CFB_FAT_SECTOR = 0xFFFFFFFD
+_CFB_NO_STREAM = 0xFFFFFFFF
+
+
+def _compound_file(streams):
+    """
+    Builds an OLE2 compound file (version 3, 512-byte sectors) holding the given streams.
+
+    Args:
+        streams (list): `(name, data)` pairs, stored as children of the root storage.
+
+    Returns:
+        bytes: The file content.
+
+    Notes:
+        - Streams are padded to the mini stream cutoff so they all live in regular sectors, and
+          the FAT must fit in a single sector: enough for files of up to about 64 KB.
+    """
+
+    sectors, fat = [], []
+
+    def allocate(data):
+        data += b"\0" * (-len(data) % _CFB_SECTOR)
+        start, count = len(sectors), len(data) // _CFB_SECTOR
+        for index in range(count):
+            sectors.append(data[index * _CFB_SECTOR:(index + 1) * _CFB_SECTOR])
+            fat.append(start + index + 1 if index < count - 1 else _CFB_END_OF_CHAIN)
+        return start
+
+    def entry(name, entry_type, right, child, start, size):
+        encoded = name.encode("utf-16-le") + b"\0\0"
+        return (
+            encoded.ljust(64, b"\0")
+            + struct.pack("<HBBIII", len(encoded), entry_type, 1, _CFB_NO_STREAM, right, child)
+            + b"\0" * 36
+            + struct.pack("<IQ", start, size)
+        )
+
+    directory = entry("Root Entry", 5, _CFB_NO_STREAM, 1 if streams else _CFB_NO_STREAM, _CFB_END_OF_CHAIN, 0)
+    for number, (name, data) in enumerate(streams, start=1):
+        data = data.ljust(_CFB_MINI_STREAM_CUTOFF, b"\0")
+        right = number + 1 if number < len(streams) else _CFB_NO_STREAM
+        directory += entry(name, 2, right, _CFB_NO_STREAM, allocate(data), len(data))
+    directory_start = allocate(directory)
+    fat_sector = len(sectors)
+    fat.append(_CFB_FAT_SECTOR)
+    if len(fat) > _CFB_SECTOR // 4:
+        raise ValueError("Streams too large for a single FAT sector")
+    sectors.append(struct.pack(f"<{len(fat)}I", *fat).ljust(_CFB_SECTOR, b"\xff"))
+
+    header = _OLE2_SIGNATURE + b"\0" * 16 + struct.pack("<HHHHH", 0x3E, 3, 0xFFFE, 9, 6) + b"\0" * 6
+    header += struct.pack(
+        "<9I", 0, 1, directory_start, 0, _CFB_MINI_STREAM_CUTOFF, _CFB_END_OF_CHAIN, 0, _CFB_END_OF_CHAIN, 0
+    )
+    header += struct.pack("<109I", fat_sector, *[_CFB_NO_STREAM] * 108)
+    return header + b"".join(sectors)
+
+
+def _ppt_record(record_type, body=b"", instance=0, container=False):
+    version_instance = (instance << 4) | (0xF if container else 0)
+    return struct.pack("<HHI", version_instance, record_type, len(body)) + body
+
+
+def _ppt_text_atom(text):
+    try:
+        return _ppt_record(0x0FA8, text.encode("latin-1"))  # TextBytesAtom
+    except UnicodeEncodeError:
+        return _ppt_record(0x0FA0, text.encode("utf-16-le"))  # TextCharsAtom
+
+
+def make_ppt97(path, slides):
+    """
+    Writes a PowerPoint 97-2003 deck whose slides keep their text in the slide list.
+
+    The title and body of each slide are stored in `SlideListWithText` (a `TextHeaderAtom` followed
+    by a text atom, after the slide's `SlidePersistAtom`); the slide itself only holds a placeholder
+    shape per text with an `OutlineTextRefAtom` pointing at it, as PowerPoint 97-2003 saves them.
+
+    Args:
+        path (str): Output file path.
+        slides (int or list): Number of slides, or the `(title, body)` text of each slide. Text that
+            Latin-1 cannot encode is stored as UTF-16.
+
+    Returns:
+        str: The output path.
+    """
+
+    if isinstance(slides, int):
+        slides = [(f"Slide {number + 1}", f"{SENTENCE} {number + 1}.") for number in range(slides)]
+
+    slide_list = b""
+    for number, texts in enumerate(slides):
+        persist_id = number + 2  # persist id 1 is the Document container
+        slide_list += _ppt_record(0x03F3, struct.pack("<IIiII", persist_id, 0, len(texts), 256 + number, 0))
+        for text_type, text in enumerate(texts):
+            slide_list += _ppt_record(0x0F9F, struct.pack("<I", text_type))  # TextHeaderAtom: title, body
+            slide_list += _ppt_text_atom(text)
+    document = _ppt_record(0x03E8, _ppt_record(0x0FF0, slide_list, container=True), container=True)
+
+    stream = bytearray(document)
+    persist_offsets = [0]
+    for texts in slides:
+        shapes = b"".join(
+            _ppt_record(0xF004, _ppt_record(0xF00D, _ppt_record(0x0F9E, struct.pack("<i", index)), container=True),
+                        container=True)
+            for index in range(len(texts))
+        )
+        drawing = _ppt_record(0x040C, _ppt_record(0xF002, _ppt_record(0xF003, shapes, container=True),
+                                                 container=True), container=True)
+        persist_offsets.append(len(stream))
+        stream += _ppt_record(0x03EE, _ppt_record(0x03EF, b"\0" * 24) + drawing, container=True)
+
+    directory_offset = len(stream)
+    entry = 1 | (len(persist_offsets) << 20)
+    stream += _ppt_record(0x1772, struct.pack(f"<I{len(persist_offsets)}I", entry, *persist_offsets))
+    edit_offset = len(stream)
+    stream += _ppt_record(0x0FF5, struct.pack(
+        "<IHBBIIIIHH", 256, 0, 0, 3, 0, directory_offset, 1, len(persist_offsets) + 1, 1, 0
+    ))
+    current_user = _ppt_record(0x0FF6, struct.pack("<IIIHHBBH", 0x14, 0xE391C05F, edit_offset, 0, 0x03F4, 3, 0, 0))
+
+    with open(path, "wb") as file:
+        file.write(_compound_file([("PowerPoint Document", bytes(stream)), ("Current User", current_user)]))
+    return path
+
+
+def make_doc97(path, paragraphs):
+    """
+    Writes a Word 97-2003 document.
+
+    Args:
+        path (str): Output file path.
+        paragraphs (int or list): Number of paragraphs, or the text of each paragraph (Word control
+            characters such as field marks or table cell marks included). Runs of paragraphs that
+            cp1252 can encode are stored as 8-bit pieces, the others as 16-bit pieces.
+
+    Returns:
+        str: The output path.
+    """
+
+    if isinstance(paragraphs, int):
+        paragraphs = [f"{SENTENCE} {number + 1}." for number in range(paragraphs)]
+
+    pieces = []
+    for paragraph in paragraphs:
+        try:
+            paragraph.encode("cp1252")
+            compressed = True
+        except UnicodeEncodeError:
+            compressed = False
+        if pieces and pieces[-1][1] == compressed:
+            pieces[-1][0] += paragraph + "\r"
+        else:
+            pieces.append([paragraph + "\r", compressed])
+
+    text_start = 0x600
+    word = bytearray(text_start)
+    characters = [0]
+    descriptors = b""
+    for text, compressed in pieces:
+        if compressed:
+            fc = (len(word) * 2) | 0x40000000  # byte offset * 2, flagged as 8-bit
+            word += text.encode("cp1252")
+        else:
+            fc = len(word)
+            word += text.encode("utf-16-le")
+        characters.append(characters[-1] + len(text))
+        descriptors += struct.pack("<HIH", 0, fc, 0)
+
+    piece_table = struct.pack(f"<{len(characters)}i", *characters) + descriptors
+    clx = b"\x02" + struct.pack("<I", len(piece_table)) + piece_table
+    struct.pack_into("<HH", word, 0x00, 0xA5EC, 0xC1)  # wIdent, nFib (Word 97)
+    struct.pack_into("<H", word, 0x0A, 0x0200)  # fWhichTblStm: 1Table
+    struct.pack_into("<H", word, 0x20, 14)  # csw
+    struct.pack_into("<H", word, 0x3E, 22)  # cslw
+    struct.pack_into("<i", word, 0x4C, characters[-1])  # ccpText
+    struct.pack_into("<H", word, 0x98, 93)  # cbRgFcLcb
+    struct.pack_into("<II", word, 0x1A2, 0, len(clx))  # fcClx, lcbClx
+
+    with open(path, "wb") as file:
+        file.write(_compound_file([("WordDocument", bytes(word)), ("1Table", clx)]))
+    return path
@@ -0,0 +1,65 @@
+-- Indexes behind the UUID lookups of Qtip_fapi/repository.py.
+--
+-- UUID columns hold the canonical 32-character lowercase hex form (Django UUIDField, char(32)).
+-- repository.normalize_uuid() converts identifiers to that form before binding them, so every
+-- lookup is `column = :param` on an indexed column: a single index seek however large the table.
+--
+-- Ownership: the tables are created by the QTip Django application, but this script belongs to the
+-- FastAPI service in this repository, which is what needs these indexes. It is applied by whoever
+-- deploys the service, against the same schema, after the Django migrations. It changes neither
+-- column types nor constraints, so the Django models stay valid and Django's own migrations are
+-- unaffected; the data rewrite only brings values to the form Django itself writes.
+--
+-- Safe to re-run: values already normalized are left alone, and an index is only created when the
+-- column is not already the leading column of an index (e.g. the one Django creates for a
+-- ForeignKey or a unique field).
+--
+-- Apply:      mysql qtip_schema < migrations/0001_uuid_lookup_indexes.sql
+-- Check with: EXPLAIN SELECT question FROM QTip_Api_presentationoriginalquestions WHERE uuid = '...';
+--             (type should be `const` or `ref`, never `ALL`)
+
+-- Rows written with dashes or in uppercase by earlier code would no longer match the normalized
+-- parameters. BINARY makes the comparison case-sensitive; the default collation is not.
+UPDATE QTip_Api_presentationknowledgebase
+SET presentation_id = LOWER(REPLACE(presentation_id, '-', ''))
+WHERE presentation_id LIKE '%-%' OR BINARY presentation_id <> LOWER(presentation_id);
+
+UPDATE QTip_Api_presentationoriginalquestions
+SET uuid = LOWER(REPLACE(uuid, '-', ''))
+WHERE uuid LIKE '%-%' OR BINARY uuid <> LOWER(uuid);
+
+-- GET /knowledgebase/{presentation_id}
+SET @statement := IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'QTip_Api_presentationknowledgebase'
+       AND column_name = 'presentation_id' AND seq_in_index = 1) = 0,
+    'CREATE INDEX idx_knowledgebase_presentation_id ON QTip_Api_presentationknowledgebase (presentation_id)',
+    'DO 0'
+);
+PREPARE create_index FROM @statement;
+EXECUTE create_index;
+DEALLOCATE PREPARE create_index;
+
+-- GET /question/{question_id}, POST /question/batch, PUT /question/ai-response/...
+SET @statement := IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'QTip_Api_presentationoriginalquestions'
+       AND column_name = 'uuid' AND seq_in_index = 1) = 0,
+    'CREATE INDEX idx_originalquestions_uuid ON QTip_Api_presentationoriginalquestions (uuid)',
+    'DO 0'
+);
+PREPARE create_index FROM @statement;
+EXECUTE create_index;
+DEALLOCATE PREPARE create_index;
+
+-- Topics are looked up and grouped by presentation.
+SET @statement := IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'QTip_Api_aigeneratedtopic'
+       AND column_name = 'presentation_id' AND seq_in_index = 1) = 0,
+    'CREATE INDEX idx_aigeneratedtopic_presentation_id ON QTip_Api_aigeneratedtopic (presentation_id)',
+    'DO 0'
+);
+PREPARE create_index FROM @statement;
+EXECUTE create_index;
+DEALLOCATE PREPARE create_index;
@@ -0,0 +1,129 @@
+"""
+Tests of `BatchLoader` in `Qtip_fapi/data_access.py`.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock
+
+from Qtip_fapi.data_access import BatchLoader
+
+VALUES = {"a": 1, "b": 2, "c": 3, "d": 4}
+
+
+class RecordingFetch:
+    """`fetch_many` returning `VALUES`, recording every call."""
+
+    def __init__(self, fail_keys=()):
+        self.calls = []
+        self.fail_keys = set(fail_keys)
+        self._lock = Lock()
+
+    def __call__(self, keys):
+        with self._lock:
+            self.calls.append(list(keys))
+        if self.fail_keys.intersection(keys):
+            raise RuntimeError(f"failed: {sorted(self.fail_keys.intersection(keys))}")
+        return {key: VALUES[key] for key in keys if key in VALUES}
+
+
+def load_concurrently(loader, keys):
+    """Runs one `loader.load` per key on its own thread; returns the results or exceptions in key order."""
+
+    def load(key):
+        try:
+            return loader.load(key)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=len(keys)) as pool:
+        return list(pool.map(load, keys))
+
+
+class BatchLoaderTest(unittest.TestCase):
+
+    def test_full_batch_closes_before_max_delay(self):
+        fetch = RecordingFetch()
+        loader = BatchLoader(fetch, max_batch=3, max_delay=10)
+
+        started = time.monotonic()
+        results = load_concurrently(loader, ["a", "b", "c"])
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(results, [1, 2, 3])
+        self.assertEqual(len(fetch.calls), 1)
+        self.assertCountEqual(fetch.calls[0], ["a", "b", "c"])
+
+    def test_partial_batch_is_flushed_after_max_delay(self):
+        fetch = RecordingFetch()
+        loader = BatchLoader(fetch, max_batch=100, max_delay=0.05)
+
+        started = time.monotonic()
+        self.assertEqual(loader.load("a"), 1)
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+        self.assertEqual(fetch.calls, [["a"]])
+
+    def test_duplicate_keys_are_fetched_once(self):
+        fetch = RecordingFetch()
+        loader = BatchLoader(fetch, max_batch=3, max_delay=10)
+
+        self.assertEqual(load_concurrently(loader, ["a", "a", "b"]), [1, 1, 2])
+        self.assertEqual(len(fetch.calls), 1)
+        self.assertCountEqual(fetch.calls[0], ["a", "b"])
+
+    def test_missing_key_returns_none(self):
+        loader = BatchLoader(RecordingFetch(), max_batch=2, max_delay=10)
+
+        self.assertEqual(load_concurrently(loader, ["a", "missing"]), [1, None])
+
+    def test_single_key_batch_raises_the_error(self):
+        loader = BatchLoader(RecordingFetch(fail_keys=["a"]), max_batch=100, max_delay=0)
+
+        with self.assertRaisesRegex(RuntimeError, "failed"):
+            loader.load("a")
+
+    def test_failed_batch_falls_back_to_one_fetch_per_key(self):
+        fetch = RecordingFetch(fail_keys=["b"])
+        loader = BatchLoader(fetch, max_batch=3, max_delay=10)
+
+        a, b, c = load_concurrently(loader, ["a", "b", "c"])
+
+        self.assertEqual((a, c), (1, 3))
+        self.assertIsInstance(b, RuntimeError)
+        self.assertCountEqual(fetch.calls[1:], [["a"], ["b"], ["c"]])
+
+    def test_failed_batch_uses_fetch_one(self):
+        fetched_alone = []
+        loader = BatchLoader(RecordingFetch(fail_keys=["a"]), max_batch=2, max_delay=10,
+                             fetch_one=lambda key: fetched_alone.append(key) or VALUES.get(key))
+
+        self.assertEqual(load_concurrently(loader, ["a", "b"]), [1, 2])
+        self.assertCountEqual(fetched_alone, ["a", "b"])
+
+    def test_waiting_on_a_hung_batch_times_out(self):
+        release = Event()
+
+        def hanging_fetch(keys):
+            release.wait()
+            return {}
+
+        loader = BatchLoader(hanging_fetch, max_batch=2, max_delay=10, timeout=0.05)
+        pool = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(pool.shutdown)
+        self.addCleanup(release.set)  # cleanups run last in, first out: release the leader first
+        leader = pool.submit(loader.load, "a")
+        while loader._open is None:
+            time.sleep(0.001)
+
+        with self.assertRaises(TimeoutError):
+            loader.load("b")  # fills the batch, then waits for the hung leader
+        self.assertFalse(leader.done())
+
+
+if __name__ == "__main__":
+    unittest.main()
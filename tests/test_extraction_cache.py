@@ -0,0 +1,65 @@
+"""
+Tests of `Qtip_fapi/extraction_cache.py`.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from Qtip_fapi import textExtract
+from Qtip_fapi.extraction_cache import ExtractionCache
+from Qtip_fapi.textExtract import get_extractor
+
+
+class ExtractionCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.cache = ExtractionCache(self.directory.name, max_bytes=1024 * 1024)
+        self.source = os.path.join(self.directory.name, "deck.bin")
+        with open(self.source, "wb") as file:
+            file.write(b"content")
+
+    def test_hit_returns_line_breaks_unchanged(self):
+        text = "line1\r\nline2\rline3\nline4"
+        extract = mock.Mock(return_value=text)
+
+        self.assertEqual(self.cache.extract(self.source, extract, "pdf"), text)
+        self.assertEqual(self.cache.extract(self.source, extract, "pdf"), text)
+        extract.assert_called_once_with(self.source)
+
+    def test_key_depends_on_fast_xml_mode(self):
+        docx = get_extractor("a.docx")
+        with mock.patch.object(textExtract, "FAST_XML_EXTRACTION", True):
+            fast_key = ExtractionCache.key("hash", docx.cache_format)
+        with mock.patch.object(textExtract, "FAST_XML_EXTRACTION", False):
+            object_model_key = ExtractionCache.key("hash", docx.cache_format)
+        self.assertNotEqual(fast_key, object_model_key)
+
+    def test_key_of_formats_without_fast_path_ignores_mode(self):
+        pdf = get_extractor("a.pdf")
+        with mock.patch.object(textExtract, "FAST_XML_EXTRACTION", False):
+            self.assertEqual(pdf.cache_format, "pdf")
+
+    def test_abandoned_temporary_files_are_evicted(self):
+        cache = ExtractionCache(self.directory.name, max_bytes=1024 * 1024, temp_max_age=60)
+        abandoned = os.path.join(self.directory.name, "abandoned.tmp")
+        fresh = os.path.join(self.directory.name, "fresh.tmp")
+        for path in (abandoned, fresh):
+            with open(path, "w") as file:
+                file.write("partial")
+        os.utime(abandoned, (0, 0))
+
+        cache.evict()
+
+        self.assertFalse(os.path.exists(abandoned))
+        self.assertTrue(os.path.exists(fresh))
+
+
+if __name__ == "__main__":
+    unittest.main()
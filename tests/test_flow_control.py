@@ -0,0 +1,159 @@
+"""
+Tests of `InFlightWindow` and `AckBatcher` in `Qtip_fapi/flow_control.py`.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import unittest
+
+from Qtip_fapi.flow_control import AckBatcher, InFlightWindow
+
+
+class FakeChannel:
+    """Records the acks and nacks sent on a channel."""
+
+    def __init__(self):
+        self.is_open = True
+        self.frames = []
+
+    def basic_ack(self, delivery_tag, multiple=False):
+        self.frames.append(("ack", delivery_tag, multiple))
+
+    def basic_nack(self, delivery_tag, requeue):
+        self.frames.append(("nack", delivery_tag, requeue))
+
+
+class FakeTimers:
+    """`call_later` that keeps the callbacks until the test fires them."""
+
+    def __init__(self):
+        self.pending = []
+
+    def __call__(self, delay, callback):
+        self.pending.append((delay, callback))
+
+    def fire(self):
+        pending, self.pending = self.pending, []
+        for _, callback in pending:
+            callback()
+
+
+class InFlightWindowTest(unittest.TestCase):
+
+    def test_acquire_stops_at_size(self):
+        window = InFlightWindow("queue", 2)
+
+        self.assertTrue(window.acquire())
+        self.assertTrue(window.acquire())
+        self.assertFalse(window.acquire())
+        self.assertEqual((window.in_flight, window.available, window.peak), (2, 0, 2))
+
+    def test_release_frees_a_slot(self):
+        window = InFlightWindow("queue", 1)
+        window.acquire()
+        window.release()
+
+        self.assertEqual(window.available, 1)
+        self.assertTrue(window.acquire())
+        self.assertEqual(window.peak, 1)
+
+    def test_release_without_acquire_raises(self):
+        with self.assertRaises(RuntimeError):
+            InFlightWindow("queue", 1).release()
+
+    def test_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            InFlightWindow("queue", 0)
+
+
+class AckBatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.channel = FakeChannel()
+        self.timers = FakeTimers()
+
+    def batcher(self, tags, batch_size=100):
+        batcher = AckBatcher(self.channel, self.timers, batch_size=batch_size, max_delay=0.2)
+        for tag in tags:
+            batcher.track(tag)
+        return batcher
+
+    def test_leading_run_is_acked_with_one_multiple_ack(self):
+        batcher = self.batcher([1, 2, 3])
+        for tag in (1, 2, 3):
+            batcher.ack(tag)
+        batcher.flush()
+
+        self.assertEqual(self.channel.frames, [("ack", 3, True)])
+
+    def test_out_of_order_completion_never_acks_unfinished_deliveries(self):
+        batcher = self.batcher([1, 2, 3, 4, 5])
+        for tag in (1, 2, 4):
+            batcher.ack(tag)  # 3 and 5 still processing
+        batcher.flush()
+
+        self.assertEqual(self.channel.frames, [("ack", 2, True), ("ack", 4, False)])
+
+        self.channel.frames.clear()
+        batcher.ack(5)
+        batcher.flush()
+        self.assertEqual(self.channel.frames, [("ack", 5, False)])  # 3 is still processing
+
+        self.channel.frames.clear()
+        batcher.ack(3)
+        batcher.flush()
+        self.assertEqual(self.channel.frames, [("ack", 3, True)])
+
+    def test_nack_in_the_middle_of_the_run(self):
+        batcher = self.batcher([1, 2, 3])
+        batcher.ack(1)
+        batcher.nack(2, requeue=True)
+        batcher.ack(3)
+        batcher.flush()
+
+        self.assertEqual(self.channel.frames, [("nack", 2, True), ("ack", 3, True)])
+
+    def test_nack_is_sent_before_pending_acks(self):
+        batcher = self.batcher([1, 2])
+        batcher.ack(1)
+        batcher.nack(2, requeue=False)
+
+        self.assertEqual(self.channel.frames, [("nack", 2, False)])
+
+    def test_full_batch_flushes_without_the_timer(self):
+        batcher = self.batcher([1, 2], batch_size=2)
+        batcher.ack(1)
+        self.assertEqual(self.channel.frames, [])
+        batcher.ack(2)
+
+        self.assertEqual(self.channel.frames, [("ack", 2, True)])
+
+    def test_timer_flushes_a_partial_batch(self):
+        batcher = self.batcher([1, 2, 3])
+        batcher.ack(1)
+        batcher.ack(2)
+
+        self.assertEqual(len(self.timers.pending), 1)  # one timer per batch
+        self.assertEqual(self.timers.pending[0][0], 0.2)
+        self.assertEqual(self.channel.frames, [])
+
+        self.timers.fire()
+        self.assertEqual(self.channel.frames, [("ack", 2, True)])
+
+        batcher.ack(3)
+        self.assertEqual(len(self.timers.pending), 1)  # re-armed for the next batch
+        self.timers.fire()
+        self.assertEqual(self.channel.frames, [("ack", 2, True), ("ack", 3, True)])
+
+    def test_closed_channel_drops_pending_acks(self):
+        batcher = self.batcher([1])
+        batcher.ack(1)
+        self.channel.is_open = False
+        batcher.flush()
+
+        self.assertEqual(self.channel.frames, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
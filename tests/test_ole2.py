@@ -0,0 +1,59 @@
+"""
+Tests of `Qtip_fapi/ole2.py` and the buffer readers of `Qtip_fapi/sources.py`.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import os
+import unittest
+
+from Qtip_fapi.ole2 import CompoundFile, CompoundFileError
+from Qtip_fapi.sources import BufferReader, map_file
+
+ASSETS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Qtip_fapi", "assets")
+
+
+class CompoundFileTest(unittest.TestCase):
+
+    def test_streams_of_a_mapped_file_are_views_of_the_mapping(self):
+        with map_file(os.path.join(ASSETS, "sample97.ppt")) as data:
+            with CompoundFile(data) as compound_file:
+                document = compound_file.read_stream("PowerPoint Document")
+                self.assertIsInstance(document, memoryview)
+                self.assertIs(document.obj, data)
+                del document
+
+    def test_open_matches_the_buffer(self):
+        path = os.path.join(ASSETS, "sample1.ppt")
+        with open(path, "rb") as file:
+            content = file.read()
+        with CompoundFile.open(path) as mapped, CompoundFile(content) as in_memory:
+            self.assertEqual(mapped.list_streams(), in_memory.list_streams())
+            for name in mapped.list_streams():
+                self.assertEqual(bytes(mapped.read_stream(name)), bytes(in_memory.read_stream(name)))
+
+    def test_views_outliving_the_file_stay_readable(self):
+        with CompoundFile.open(os.path.join(ASSETS, "sample97.doc")) as compound_file:
+            word_document = compound_file.read_stream("WordDocument")
+        self.assertEqual(bytes(word_document[:2]), b"\xec\xa5")
+
+    def test_not_a_compound_file(self):
+        with self.assertRaises(CompoundFileError):
+            CompoundFile(b"PK\x03\x04" + b"\0" * 600)
+
+
+class BufferReaderTest(unittest.TestCase):
+
+    def test_readinto_and_read(self):
+        reader = BufferReader(memoryview(b"hello world"))
+        target = bytearray(5)
+
+        self.assertEqual(reader.readinto(target), 5)
+        self.assertEqual(target, b"hello")
+        self.assertEqual(reader.read(), b" world")
+        self.assertEqual(reader.readinto(target), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
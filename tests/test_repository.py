@@ -0,0 +1,205 @@
+"""
+Tests of `PreparedQuery` in `Qtip_fapi/database.py` and of the query helpers of `Qtip_fapi/repository.py`.
+
+No database server is needed: statements are checked as compiled text, and the batched writes run
+against a recording stand-in for the prepared statement.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import contextlib
+import unittest
+import uuid
+from unittest import mock
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, bindparam, select
+
+from Qtip_fapi import repository
+from Qtip_fapi.database import PreparedQuery
+
+items = Table("items", MetaData(), Column("id", Integer), Column("name", String(10)))
+
+
+def sqlalchemy_text(statement, **values):
+    """The statement as SQLAlchemy itself renders it for these values, expanding lists spelled out."""
+
+    return statement.params(**values).compile(
+        dialect=PreparedQuery.dialect, compile_kwargs={"render_postcompile": True}
+    ).string
+
+
+class PreparedQueryTest(unittest.TestCase):
+
+    def test_single_expanding_parameter(self):
+        query = PreparedQuery(select(items.c.name).where(items.c.id.in_(bindparam("ids", expanding=True))))
+
+        sql, params = query._statement({"ids": [4, 5, 6]})
+
+        self.assertIn("items.id IN (%(ids_1)s, %(ids_2)s, %(ids_3)s)", sql)
+        self.assertEqual(params, {"ids_1": 4, "ids_2": 5, "ids_3": 6})
+        self.assertNotIn("POSTCOMPILE", sql)
+
+    def test_two_expanding_parameters_and_a_plain_one(self):
+        statement = (
+            select(items.c.id)
+            .where(items.c.id.in_(bindparam("ids", expanding=True)))
+            .where(items.c.name.in_(bindparam("names", expanding=True)))
+            .where(items.c.id > bindparam("minimum"))
+        )
+        query = PreparedQuery(statement)
+
+        sql, params = query._statement({"ids": [1, 2], "names": ["a"], "minimum": 0})
+
+        self.assertIn("items.id IN (%(ids_1)s, %(ids_2)s)", sql)
+        self.assertIn("items.name IN (%(names_1)s)", sql)
+        self.assertIn("items.id > %(minimum)s", sql)
+        self.assertEqual(params, {"ids_1": 1, "ids_2": 2, "names_1": "a", "minimum": 0})
+        self.assertEqual(sql, sqlalchemy_text(statement, ids=[1, 2], names=["a"], minimum=0))
+
+    def test_text_is_cached_per_list_lengths(self):
+        query = PreparedQuery(select(items.c.name).where(items.c.id.in_(bindparam("ids", expanding=True))))
+
+        first, _ = query._statement({"ids": [1, 2]})
+        second, params = query._statement({"ids": [3, 4]})
+        third, _ = query._statement({"ids": [5]})
+
+        self.assertIs(first, second)
+        self.assertEqual(params, {"ids_1": 3, "ids_2": 4})
+        self.assertNotEqual(first, third)
+        self.assertEqual(set(query._expanded_sql), {(2,), (1,)})
+
+    def test_empty_list_raises(self):
+        query = PreparedQuery(select(items.c.name).where(items.c.id.in_(bindparam("ids", expanding=True))))
+
+        with self.assertRaises(ValueError):
+            query._statement({"ids": []})
+
+    def test_plain_statement_is_sent_as_compiled(self):
+        query = PreparedQuery(select(items.c.name).where(items.c.id == bindparam("id")))
+
+        sql, params = query._statement({"id": 7})
+
+        self.assertIs(sql, query.sql)
+        self.assertEqual(params, {"id": 7})
+
+
+class PreparedQueryExecuteManyTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_execute_many_rejects_expanding_statements(self):
+        query = PreparedQuery(select(items.c.name).where(items.c.id.in_(bindparam("ids", expanding=True))))
+
+        with self.assertRaises(ValueError):
+            await query.execute_many([{"ids": [1]}])
+
+    async def test_execute_many_without_values_is_a_no_op(self):
+        query = PreparedQuery(items.insert())
+
+        self.assertEqual(await query.execute_many([]), 0)
+
+
+class NormalizeUuidTest(unittest.TestCase):
+
+    def test_spellings_normalize_to_lowercase_hex(self):
+        value = uuid.UUID("12345678-9abc-def0-1234-56789abcdef0")
+        for spelling in (
+            "12345678-9abc-def0-1234-56789abcdef0",
+            "12345678-9ABC-DEF0-1234-56789ABCDEF0",
+            "123456789abcdef0123456789abcdef0",
+            "{12345678-9abc-def0-1234-56789abcdef0}",
+            "urn:uuid:12345678-9abc-def0-1234-56789abcdef0",
+            value,
+        ):
+            with self.subTest(spelling=spelling):
+                self.assertEqual(repository.normalize_uuid(spelling), "123456789abcdef0123456789abcdef0")
+
+    def test_not_a_uuid_raises(self):
+        for value in ("", "not-a-uuid", "12345", 12345):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                repository.normalize_uuid(value)
+
+
+class RecordingQuery:
+    """Stand-in for a `PreparedQuery`, recording the values of every `execute`."""
+
+    def __init__(self, count, calls):
+        self.count = count
+        self.calls = calls
+
+    async def execute(self, values=None):
+        self.calls.append((self.count, values))
+        return self.count
+
+
+@contextlib.asynccontextmanager
+async def no_transaction():
+    yield
+
+
+class UpdateQuestionAiResponsesTest(unittest.IsolatedAsyncioTestCase):
+
+    async def run_update(self, responses, per_update=512, calls=None):
+        calls = [] if calls is None else calls
+        with mock.patch.object(repository, "_update_question_ai_responses_query",
+                               lambda count: RecordingQuery(count, calls)), \
+                mock.patch.object(repository, "_AI_RESPONSES_PER_UPDATE", per_update), \
+                mock.patch.object(repository.database, "transaction", no_transaction):
+            await repository.update_question_ai_responses(responses)
+        return calls
+
+    @staticmethod
+    def question_id(index):
+        return uuid.UUID(int=index).hex
+
+    async def test_chunk_is_padded_to_a_power_of_two_with_its_last_response(self):
+        responses = [(self.question_id(index), f"topic {index}", index % 2 == 0) for index in range(5)]
+
+        calls = await self.run_update(responses)
+
+        self.assertEqual(len(calls), 1)
+        count, values = calls[0]
+        self.assertEqual(count, 8)
+        self.assertEqual(len(values), 3 * 8)
+        for index in range(5):
+            self.assertEqual(values[f"question_id_{index}"], self.question_id(index))
+            self.assertEqual(values[f"topic_{index}"], f"topic {index}")
+            self.assertEqual(values[f"is_relevant_{index}"], 1 if index % 2 == 0 else 0)
+        for index in range(5, 8):
+            self.assertEqual(values[f"question_id_{index}"], self.question_id(4))
+            self.assertEqual(values[f"topic_{index}"], "topic 4")
+            self.assertEqual(values[f"is_relevant_{index}"], 1)
+
+    async def test_exact_power_of_two_is_not_padded(self):
+        calls = await self.run_update([(self.question_id(index), "t", True) for index in range(4)])
+
+        self.assertEqual([count for count, _ in calls], [4])
+
+    async def test_responses_are_split_into_chunks(self):
+        calls = await self.run_update([(self.question_id(index), "t", True) for index in range(11)], per_update=4)
+
+        self.assertEqual([count for count, _ in calls], [4, 4, 4])
+        self.assertEqual(calls[2][1]["question_id_3"], self.question_id(10))  # 3 responses padded to 4
+
+    async def test_last_response_of_a_question_wins(self):
+        question_id = self.question_id(1)
+        calls = await self.run_update([(question_id, "first", True), (question_id.upper(), "second", False)])
+
+        self.assertEqual(calls, [(1, {"question_id_0": question_id, "topic_0": "second", "is_relevant_0": 0})])
+
+    async def test_invalid_uuid_writes_nothing(self):
+        calls = []
+        with self.assertRaises(ValueError):
+            await self.run_update([(self.question_id(1), "t", True), ("nope", "t", True)], calls=calls)
+        self.assertEqual(calls, [])
+
+    def test_compiled_update_matches_parameters(self):
+        query = repository._update_question_ai_responses_query(2)
+
+        for name in ("question_id_0", "question_id_1", "topic_0", "topic_1", "is_relevant_0", "is_relevant_1"):
+            self.assertIn(f"%({name})s", query.sql)
+        self.assertIn("CASE `QTip_Api_presentationoriginalquestions`.uuid", query.sql)
+        self.assertIs(repository._update_question_ai_responses_query(2), query)
+
+
+if __name__ == "__main__":
+    unittest.main()
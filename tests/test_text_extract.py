@@ -0,0 +1,152 @@
+"""
+Tests of the legacy Office parsers and the format detection of `Qtip_fapi/textExtract.py`, against
+the fixtures in `Qtip_fapi/assets`.
+
+`sample97.ppt` and `sample97.doc` are written by `benchmarks/synthetic.py` (`make_ppt97`, `make_doc97`).
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import importlib
+import unittest
+from unittest import mock
+
+from Qtip_fapi import textExtract
+from Qtip_fapi.textExtract import (
+    MIME_DOC,
+    MIME_PPT,
+    DocxExtractor,
+    PptxExtractor,
+    UnsupportedFormatError,
+    extract_text,
+    extract_text_from_doc,
+    find_extractor,
+    iter_text_from_doc,
+    iter_text_from_ppt,
+    sniff_mime_type,
+)
+
+ASSETS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Qtip_fapi", "assets")
+
+
+def asset(name):
+    return os.path.join(ASSETS, name)
+
+
+class PptTextTest(unittest.TestCase):
+
+    def test_outline_text_refs_resolve_to_slide_list_text(self):
+        # Both slides hold only OutlineTextRefAtom records; their text lives in SlideListWithText.
+        self.assertEqual(
+            list(iter_text_from_ppt(asset("sample97.ppt"))),
+            ["Legacy Deck Café notes Second line ", "Résumé ✓ Body with break "],
+        )
+
+    def test_text_atoms_inside_slides(self):
+        slides = list(iter_text_from_ppt(asset("sample1.ppt")))
+        self.assertEqual(len(slides), 3)
+        self.assertEqual(slides[0], "Sample Presentation Lorem ipsum dolor sit amet ")
+        self.assertTrue(slides[2].startswith("Aliquam quis elit ligula."))
+
+    def test_content_is_sniffed_as_ppt(self):
+        with open(asset("sample97.ppt"), "rb") as file:
+            content = file.read()
+        self.assertEqual(sniff_mime_type(content), MIME_PPT)
+        self.assertEqual(extract_text(content), extract_text(asset("sample97.ppt")))
+
+
+class DocTextTest(unittest.TestCase):
+
+    def test_piece_table_text(self):
+        # 8-bit (cp1252) and 16-bit pieces; field codes dropped, field results kept.
+        self.assertEqual(
+            list(iter_text_from_doc(asset("sample97.doc"))),
+            ["Hello café world", "See the link here", "Ünïcødé ✓ heading", "Last\nline"],
+        )
+
+    def test_extract_text_joins_paragraphs(self):
+        self.assertEqual(
+            extract_text_from_doc(asset("sample97.doc")),
+            "Hello café world\nSee the link here\nÜnïcødé ✓ heading\nLast\nline",
+        )
+
+    def test_content_is_sniffed_as_doc(self):
+        with open(asset("sample97.doc"), "rb") as file:
+            content = file.read()
+        self.assertEqual(sniff_mime_type(content), MIME_DOC)
+        self.assertEqual(extract_text(content), extract_text_from_doc(asset("sample97.doc")))
+
+
+class FindExtractorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "wb") as file:
+            file.write(content)
+        return path
+
+    def test_unrecognised_content_with_container_extension_is_rejected(self):
+        html = b"<html><body>502 Bad Gateway</body></html>"
+        for name in ("error.docx", "error.pptx", "error.ppt", "error.doc", "error.odp"):
+            with self.subTest(name=name), self.assertRaises(UnsupportedFormatError):
+                find_extractor(self.write(name, html))
+
+    def test_content_of_another_container_format_is_rejected(self):
+        with open(asset("samplepptx.pptx"), "rb") as file:
+            content = file.read()
+        with self.assertRaises(UnsupportedFormatError):
+            find_extractor(self.write("deck.ppt", content))
+        with self.assertRaises(UnsupportedFormatError):
+            find_extractor(content, "deck.docx")
+
+    def test_matching_content_is_accepted(self):
+        self.assertEqual(find_extractor(asset("sample97.ppt")).name, "ppt")
+        with open(asset("sample97.doc"), "rb") as file:
+            self.assertEqual(find_extractor(file.read(), "upload.doc").name, "doc")
+
+    def test_pdf_falls_back_to_the_extension(self):
+        # The PDF header may come after more than a kilobyte of leading junk.
+        path = self.write("late-header.pdf", b"\0" * 2048 + b"%PDF-1.4\n")
+        self.assertEqual(find_extractor(path).name, "pdf")
+
+
+class PreloadTest(unittest.TestCase):
+
+    @staticmethod
+    def import_without(*missing):
+        real_import = importlib.import_module
+
+        def import_module(name, *args):
+            if name in missing:
+                raise ImportError(f"No module named '{name}'")
+            return real_import(name, *args)
+
+        return mock.patch("importlib.import_module", import_module)
+
+    def test_xml_formats_do_not_need_the_object_model_libraries(self):
+        with self.import_without("pptx", "docx"), mock.patch.object(textExtract, "FAST_XML_EXTRACTION", True):
+            PptxExtractor().preload()
+            DocxExtractor().preload()
+
+    def test_object_model_libraries_are_required_without_fast_xml(self):
+        with self.import_without("pptx", "docx"), mock.patch.object(textExtract, "FAST_XML_EXTRACTION", False):
+            with self.assertRaises(ImportError):
+                PptxExtractor().preload()
+            with self.assertRaises(ImportError):
+                DocxExtractor().preload()
+
+    def test_lxml_is_required(self):
+        with self.import_without("lxml.etree"), mock.patch.object(textExtract, "FAST_XML_EXTRACTION", True):
+            with self.assertRaises(ImportError):
+                PptxExtractor().preload()
+
+
+if __name__ == "__main__":
+    unittest.main()
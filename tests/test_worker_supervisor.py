@@ -0,0 +1,67 @@
+"""
+Tests of `WorkerSupervisor` in `Qtip_fapi/worker_supervisor.py`.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import sys
+import time
+import unittest
+
+from Qtip_fapi.worker_supervisor import WorkerSupervisor
+
+
+def exit_cleanly():
+    sys.exit(0)
+
+
+def crash():
+    sys.exit(1)
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.05)
+
+
+class WorkerSupervisorTest(unittest.TestCase):
+
+    def supervisor(self, target):
+        supervisor = WorkerSupervisor(target=target, workers=1, shutdown_timeout=5, min_uptime=0)
+        supervisor.start()
+        self.addCleanup(supervisor.stop)
+        return supervisor
+
+    def test_clean_exit_is_not_restarted(self):
+        supervisor = self.supervisor(exit_cleanly)
+        first = supervisor._processes[0]
+
+        wait_for(lambda: supervisor._exited[0])
+        time.sleep(1.2)  # two more monitor ticks
+
+        self.assertIs(supervisor._processes[0], first)
+        self.assertEqual(supervisor.alive, 0)
+
+    def test_crash_is_restarted(self):
+        supervisor = self.supervisor(crash)
+        first = supervisor._processes[0]
+
+        wait_for(lambda: supervisor._processes[0] is not first)
+
+    def test_no_restart_after_stop(self):
+        supervisor = self.supervisor(crash)
+        supervisor.stop()
+        processes = list(supervisor._processes)
+
+        time.sleep(1.2)
+
+        self.assertEqual(supervisor._processes, processes)
+        self.assertEqual(supervisor.alive, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()